@@ -1,33 +1,245 @@
 import os
+import logging
+import itertools
+import re
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-import string # Import string module for sanitization
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from invoice_models import Invoice
+
+logger = logging.getLogger(__name__)
+
+# Bump this whenever a change can alter the written workbooks (values, layout
+# or formatting), so the run manifest rewrites files from an older writer.
+WRITER_VERSION = "1"
+
+# Characters XLSX (XML 1.0) cannot store: C0 controls other than tab, newline
+# and carriage return, lone surrogates, and the non-characters U+FFFE/U+FFFF.
+# Everything else, including ₹ and other non-ASCII text, is kept.
+_ILLEGAL_XML_CHARS_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+# The same minus NUL, which sanitize_excel_row() uses to separate the values of a row
+_ROW_SEPARATOR = '\x00'
+_ILLEGAL_XML_CHARS_BUT_SEPARATOR_RE = re.compile('[\x01-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
 
 def sanitize_excel_cell_value(value):
     """
     Sanitizes a value for writing to an Excel cell.
-    Converts to string, removes non-printable characters, and replaces newlines.
+    Converts to string, removes characters that are illegal in XLSX, and replaces newlines.
     """
     if value is None:
         return ""
     
-    s_value = str(value)
-    # Remove characters that are not in string.printable (e.g., control characters)
-    sanitized_s_value = ''.join(char for char in s_value if char in string.printable)
+    # Remove characters Excel cannot store (e.g., control characters)
+    sanitized_s_value = _ILLEGAL_XML_CHARS_RE.sub('', str(value))
     # Replace common problematic characters or sequences
     sanitized_s_value = sanitized_s_value.replace('\r\n', ' ').replace('\n', ' ').replace('\r', ' ')
     sanitized_s_value = sanitized_s_value.strip()
     return sanitized_s_value
 
-def write_to_excel(parsed_invoices, output_filepath, sheet_name="Invoices"):
+def sanitize_excel_row(values):
+    """
+    Sanitizes a whole row (or column) of values at once: the values are joined
+    with NUL, which XLSX cannot store anyway, so the illegal-character regex
+    and the newline replacements each run once per row instead of once per cell.
+
+    Returns:
+        list: sanitize_excel_cell_value() of each value, in order.
+    """
+    texts = ["" if value is None else str(value) for value in values]
+    row_text = _ROW_SEPARATOR.join(texts)
+    if row_text.count(_ROW_SEPARATOR) != len(texts) - 1:
+        # A value holds NUL itself (or the row is empty): fall back to one cell at a time
+        return [sanitize_excel_cell_value(value) for value in values]
+    row_text = _ILLEGAL_XML_CHARS_BUT_SEPARATOR_RE.sub('', row_text)
+    row_text = row_text.replace('\r\n', ' ').replace('\n', ' ').replace('\r', ' ')
+    return [text.strip() for text in row_text.split(_ROW_SEPARATOR)]
+
+HEADERS = [
+    "Invoice Type", "Invoice Number", "Order ID", "Invoice Date", "Total Amount",
+    "Item Description", "Item Quantity", "Item Unit Price", "Item Total Price"
+]
+
+# Named styles registered once per workbook in write-only mode, so every cell
+# shares one style record instead of each cell carrying its own border.
+HEADER_STYLE_NAME = "invoice_header"
+CELL_STYLE_NAME = "invoice_cell"
+
+# Source keys for the invoice-level and item-level columns, in HEADERS order
+INVOICE_FIELDS = ("Invoice Type", "Invoice Number", "Order ID", "Invoice Date", "Total Amount")
+ITEM_FIELDS = ("Description", "Quantity", "Unit Price", "Total Item Price")
+
+# In write-only mode, column widths must be known before the first row is
+# written, so they are sized from this many buffered rows.
+DEFAULT_WRITE_ONLY_WIDTH_SAMPLE_ROWS = 1000
+
+class ColumnWidthTracker:
+    """
+    Tracks the widest value per column while rows are appended, so the
+    auto-fit widths are known without re-reading the sheet afterwards.
+
+    Width is the length of str(value) plus 2, at least as wide as the header,
+    as Excel has no real text measurement to offer here.
+    """
+
+    def __init__(self, headers, sample_rows=None, max_width=None):
+        """
+        Args:
+            headers (list): The header row; each column starts at its header's length.
+            sample_rows (int, optional): Only measure this many rows; later rows are ignored.
+            max_width (int, optional): Upper limit for any column width.
+        """
+        self.max_lengths = [len(str(header)) for header in headers]
+        self.sample_rows = sample_rows
+        self.max_width = max_width
+        self.rows_seen = 0
+
+    def update(self, row_data):
+        if self.sample_rows is not None and self.rows_seen >= self.sample_rows:
+            return
+        self.rows_seen += 1
+        max_lengths = self.max_lengths
+        for col_idx, value in enumerate(row_data):
+            if value is None:
+                continue
+            length = len(str(value))
+            if col_idx >= len(max_lengths):
+                max_lengths.append(length)
+            elif length > max_lengths[col_idx]:
+                max_lengths[col_idx] = length
+
+    def widths(self):
+        """
+        Returns:
+            list: The column widths, in column order.
+        """
+        widths = [max_length + 2 for max_length in self.max_lengths]
+        if self.max_width is not None:
+            widths = [min(width, self.max_width) for width in widths]
+        return widths
+
+    def apply(self, ws):
+        """
+        Sets the tracked widths on the worksheet's column dimensions.
+        """
+        for col_idx, width in enumerate(self.widths(), 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+def _make_styles():
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+    thin_border = Border(left=Side(style='thin'), 
+                         right=Side(style='thin'), 
+                         top=Side(style='thin'), 
+                         bottom=Side(style='thin'))
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    return header_font, header_fill, thin_border, header_alignment
+
+def _to_float(value_str):
+    try:
+        return float(value_str)
+    except ValueError:
+        return value_str # Keep as string if conversion fails
+
+def _iter_typed_invoice_rows(invoice):
+    """
+    Yields the rows of an Invoice. Its numbers are already int/float, so only
+    the text fields go through sanitization and nothing is converted back
+    from strings.
+    """
+    invoice_type, invoice_number, order_id, invoice_date = sanitize_excel_row(
+        (invoice.invoice_type, invoice.invoice_number, invoice.order_id, invoice.invoice_date)
+    )
+    base_row = [
+        invoice_type,
+        invoice_number,
+        order_id,
+        invoice_date,
+        "" if invoice.total_amount is None else invoice.total_amount
+    ]
+
+    if invoice.items:
+        for item in invoice.items:
+            yield base_row + [
+                sanitize_excel_cell_value(item.description),
+                item.quantity,
+                item.unit_price,
+                item.total_item_price
+            ]
+    else:
+        yield base_row + ["", "", "", ""] # Add empty cells for item columns
+    logger.debug("Appended invoice data for Order ID: %s", order_id)
+
+def _iter_invoice_rows(parsed_invoices):
+    """
+    Yields one row of cell values (in HEADERS order) per line item, or a
+    single row for an invoice without items.
+
+    Invoices can be Invoice objects, as the parsers return, or dictionaries
+    in the Invoice.to_dict() form.
+    """
+    for invoice in parsed_invoices:
+        if isinstance(invoice, Invoice):
+            yield from _iter_typed_invoice_rows(invoice)
+            continue
+
+        # Get and sanitize base invoice details
+        invoice_type, invoice_number, order_id, invoice_date, total_amount_str = sanitize_excel_row(
+            invoice.get(field) for field in INVOICE_FIELDS
+        )
+        
+        # Attempt to convert total_amount to float, otherwise keep as sanitized string
+        total_amount = _to_float(total_amount_str)
+
+        base_row = [
+            invoice_type,
+            invoice_number,
+            order_id,
+            invoice_date,
+            total_amount
+        ]
+
+        items = invoice.get("Items", [])
+        if items:
+            for item in items:
+                row_data = list(base_row) # Create a copy of base_row
+                
+                item_description, item_quantity_str, item_unit_price_str, item_total_price_str = sanitize_excel_row(
+                    item.get(field) for field in ITEM_FIELDS
+                )
+
+                # Attempt to convert item numerical values to float/int
+                try:
+                    item_quantity = int(float(item_quantity_str)) # Handle floats like "1.0"
+                except ValueError:
+                    item_quantity = item_quantity_str
+
+                item_unit_price = _to_float(item_unit_price_str)
+                item_total_price = _to_float(item_total_price_str)
+
+                row_data.extend([
+                    item_description,
+                    item_quantity,
+                    item_unit_price,
+                    item_total_price
+                ])
+                yield row_data
+        else:
+            # If no items, still append the main invoice data
+            yield list(base_row) + ["", "", "", ""] # Add empty cells for item columns
+        logger.debug("Appended invoice data for Order ID: %s", order_id)
+
+def write_to_excel(parsed_invoices, output_filepath, sheet_name="Invoices", write_only=False,
+                   width_sample_rows=None, max_column_width=None):
     """
     Writes parsed invoice data to an Excel file.
 
     Args:
-        parsed_invoices (list): A list of dictionaries, where each dictionary
-                                represents a parsed invoice section.
-                                Expected structure:
+        parsed_invoices (list): A list of Invoice objects as returned by the
+                                parsers, or of dictionaries in the
+                                Invoice.to_dict() form, each representing a
+                                parsed invoice section.
+                                Expected dictionary structure:
                                 {
                                     "Invoice Type": "...",
                                     "Invoice Number": "...",
@@ -39,14 +251,31 @@ def write_to_excel(parsed_invoices, output_filepath, sheet_name="Invoices"):
                                         ...
                                     ]
                                 }
+                                In write-only mode any iterable of such
+                                invoices works, e.g. a generator.
         output_filepath (str): The full path to the output Excel file (e.g., "output/invoices.xlsx").
         sheet_name (str): The name of the sheet to write the data to.
+        write_only (bool): Stream rows to disk with openpyxl's write-only mode,
+                           so memory stays flat for very large exports.
+        width_sample_rows (int, optional): Size columns from the first N data rows
+                                           only. Defaults to every row, or to
+                                           DEFAULT_WRITE_ONLY_WIDTH_SAMPLE_ROWS
+                                           in write-only mode.
+        max_column_width (int, optional): Upper limit for the auto-fit column widths.
     """
-    if not parsed_invoices:
-        print("Debug: No parsed invoice data to write to Excel.")
+    if not write_only and not parsed_invoices:
+        logger.debug("No parsed invoice data to write to Excel.")
         return
 
     try:
+        if write_only:
+            if width_sample_rows is None:
+                width_sample_rows = DEFAULT_WRITE_ONLY_WIDTH_SAMPLE_ROWS
+            _write_streaming(parsed_invoices, output_filepath, sheet_name,
+                             ColumnWidthTracker(HEADERS, width_sample_rows, max_column_width))
+            logger.debug("Successfully saved workbook to '%s'.", output_filepath)
+            return
+
         # Create a new workbook and select the active sheet
         wb = Workbook()
         
@@ -54,117 +283,38 @@ def write_to_excel(parsed_invoices, output_filepath, sheet_name="Invoices"):
         # Use a safe slice or truncate if needed, but the main_extractor will handle shorter names
         ws = wb.active
         ws.title = sheet_name[:31] # Truncate to max 31 characters for safety
-        print(f"Debug: Created workbook and sheet '{ws.title}'.")
+        logger.debug("Created workbook and sheet '%s'.", ws.title)
 
-        # Define header row (general invoice data first, then item specific)
-        headers = [
-            "Invoice Type", "Invoice Number", "Order ID", "Invoice Date", "Total Amount",
-            "Item Description", "Item Quantity", "Item Unit Price", "Item Total Price"
-        ]
-        
         # Apply header styling
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-        thin_border = Border(left=Side(style='thin'), 
-                             right=Side(style='thin'), 
-                             top=Side(style='thin'), 
-                             bottom=Side(style='thin'))
-
-        ws.append(headers)
-        for col_idx in range(1, len(headers) + 1):
+        header_font, header_fill, thin_border, header_alignment = _make_styles()
+
+        ws.append(HEADERS)
+        for col_idx in range(1, len(HEADERS) + 1):
             cell = ws.cell(row=1, column=col_idx)
             cell.font = header_font
             cell.fill = header_fill
             cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-        print("Debug: Wrote headers to Excel.")
-
-        # Write data rows
-        for invoice in parsed_invoices:
-            # Get and sanitize base invoice details
-            invoice_type = sanitize_excel_cell_value(invoice.get("Invoice Type"))
-            invoice_number = sanitize_excel_cell_value(invoice.get("Invoice Number"))
-            order_id = sanitize_excel_cell_value(invoice.get("Order ID"))
-            invoice_date = sanitize_excel_cell_value(invoice.get("Invoice Date"))
-            
-            # Attempt to convert total_amount to float, otherwise keep as sanitized string
-            total_amount_str = sanitize_excel_cell_value(invoice.get("Total Amount"))
-            try:
-                total_amount = float(total_amount_str)
-            except ValueError:
-                total_amount = total_amount_str # Keep as string if conversion fails
-
-            base_row = [
-                invoice_type,
-                invoice_number,
-                order_id,
-                invoice_date,
-                total_amount
-            ]
+            cell.alignment = header_alignment
+        logger.debug("Wrote headers to Excel.")
 
-            items = invoice.get("Items", [])
-            if items:
-                for i, item in enumerate(items):
-                    row_data = list(base_row) # Create a copy of base_row
-                    
-                    # Sanitize item description
-                    item_description = sanitize_excel_cell_value(item.get("Description"))
-
-                    # Attempt to convert item numerical values to float/int
-                    item_quantity_str = sanitize_excel_cell_value(item.get("Quantity"))
-                    try:
-                        item_quantity = int(float(item_quantity_str)) # Handle floats like "1.0"
-                    except ValueError:
-                        item_quantity = item_quantity_str
-
-                    item_unit_price_str = sanitize_excel_cell_value(item.get("Unit Price"))
-                    try:
-                        item_unit_price = float(item_unit_price_str)
-                    except ValueError:
-                        item_unit_price = item_unit_price_str
-
-                    item_total_price_str = sanitize_excel_cell_value(item.get("Total Item Price"))
-                    try:
-                        item_total_price = float(item_total_price_str)
-                    except ValueError:
-                        item_total_price = item_total_price_str
-
-                    row_data.extend([
-                        item_description,
-                        item_quantity,
-                        item_unit_price,
-                        item_total_price
-                    ])
-                    ws.append(row_data)
-                    # Apply border to all cells in the row
-                    for col_idx in range(1, len(row_data) + 1):
-                        ws.cell(row=ws.max_row, column=col_idx).border = thin_border
-            else:
-                # If no items, still append the main invoice data
-                ws.append(list(base_row) + ["", "", "", ""]) # Add empty cells for item columns
-                # Apply border to all cells in the row
-                for col_idx in range(1, len(headers) + 1):
-                    ws.cell(row=ws.max_row, column=col_idx).border = thin_border
-            print(f"Debug: Appended invoice data for Order ID: {order_id}")
+        # Write data rows, measuring column widths as they go
+        width_tracker = ColumnWidthTracker(HEADERS, width_sample_rows, max_column_width)
+        row_idx = 1 # Tracked here because ws.max_row scans every cell on each call
+        for row_data in _iter_invoice_rows(parsed_invoices):
+            ws.append(row_data)
+            width_tracker.update(row_data)
+            row_idx += 1
+            # Apply border to all cells in the row
+            for col_idx in range(1, len(row_data) + 1):
+                ws.cell(row=row_idx, column=col_idx).border = thin_border
 
         # Adjust column widths for better readability
-        for col_idx, header in enumerate(headers, 1):
-            max_length = len(header)
-            for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=col_idx, max_col=col_idx):
-                for cell in row:
-                    try:
-                        # Consider string length for width calculation
-                        cell_value_str = str(cell.value) if cell.value is not None else ""
-                        max_length = max(max_length, len(cell_value_str))
-                    except TypeError:
-                        pass 
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
-        print("Debug: Adjusted column widths.")
+        width_tracker.apply(ws)
+        logger.debug("Adjusted column widths.")
 
         # Save the workbook
         wb.save(output_filepath)
-        print(f"Debug: Successfully saved workbook to '{output_filepath}'.")
+        logger.debug("Successfully saved workbook to '%s'.", output_filepath)
 
     except ModuleNotFoundError:
         print("Error: 'openpyxl' library not found. Please install it using 'pip install openpyxl'")
@@ -173,8 +323,43 @@ def write_to_excel(parsed_invoices, output_filepath, sheet_name="Invoices"):
         import traceback
         traceback.print_exc() # Print full traceback for unexpected errors
 
+def _write_streaming(parsed_invoices, output_filepath, sheet_name, width_tracker):
+    """
+    write_to_excel() in openpyxl write-only mode: each row is serialized as
+    soon as it is appended and no cell objects are kept.
+
+    Column widths must be set before the first row is written, so the first
+    width_tracker.sample_rows rows are buffered and measured, the widths are
+    set, and then everything is streamed out.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name[:31])
+
+    header_font, header_fill, thin_border, header_alignment = _make_styles()
+    wb.add_named_style(NamedStyle(name=HEADER_STYLE_NAME, font=header_font, fill=header_fill,
+                                  border=thin_border, alignment=header_alignment))
+    wb.add_named_style(NamedStyle(name=CELL_STYLE_NAME, border=thin_border))
+
+    rows = _iter_invoice_rows(parsed_invoices)
+    sampled_rows = list(itertools.islice(rows, width_tracker.sample_rows))
+    for row_data in sampled_rows:
+        width_tracker.update(row_data)
+    width_tracker.apply(ws)
+
+    ws.append([_styled_cell(ws, header, HEADER_STYLE_NAME) for header in HEADERS])
+    for row_data in itertools.chain(sampled_rows, rows):
+        ws.append([_styled_cell(ws, value, CELL_STYLE_NAME) for value in row_data])
+
+    wb.save(output_filepath)
+
+def _styled_cell(ws, value, style_name):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style_name
+    return cell
+
 # This block is for testing excel_writer.py independently if needed
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(name)s: %(message)s")
     print("--- Running excel_writer.py independently for testing ---")
     
     # Create a dummy output folder for independent testing
@@ -1,5 +1,190 @@
 import re
+import collections
 import string # Import string module for sanitization
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from vendor_detector import register_vendor
+from text_index import TextIndex
+from invoice_models import Invoice, LineItem, parse_amount
+from log_config import configure_logging
+
+# Bump this whenever a parsing change can alter the extracted data, so the
+# run manifest reprocesses PDFs that were parsed by an older version.
+PARSER_VERSION = "6"
+
+logger = logging.getLogger(__name__)
+
+_TOTAL_LABEL_RE = re.compile(r"TOTAL:", re.IGNORECASE)
+_GRAND_TOTAL_RE = re.compile(r"(?:Grand Total|Total Amount|Total Price):\s*(?:₹)?\s*([\d,]+\.?\d*)", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"[\d,]+\.?\d*")
+
+def _is_number_char(char):
+    return char == "," or char == "." or char.isdecimal() # isdecimal() is what re's \d matches
+
+def _extract_total_amount(text, lines, item_section_end_line_index):
+    """
+    Finds the invoice total by scanning back from the end of the text, so the
+    work is proportional to the footer rather than the whole document.
+
+    Gives the same result as the earlier whole-text DOTALL searches, tried in order:
+      1. "TOTAL:" anywhere, and the text ends (ignoring whitespace) with a number,
+         optionally preceded by ₹: that number.
+      2. "TOTAL:" anywhere, and the text ends with a quoted number after a comma
+         (CSV-like TOTAL: line): that number.
+      3. The first "Grand Total:", "Total Amount:" or "Total Price:" value.
+
+    Args:
+        text (str): The full invoice text.
+        lines (list): The lines of text, e.g. TextIndex.stripped_lines.
+        item_section_end_line_index (int): The line the item table ended at,
+                                           usually the "TOTAL:" line itself.
+
+    Returns:
+        str: The total without thousands separators, or "" if none was found.
+    """
+    # Skip trailing whitespace
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+
+    # The earliest start from which text[start:end] is a whole number is what
+    # the lazy ".*?" of the old pattern stopped at
+    start = end
+    while start and _is_number_char(text[start - 1]):
+        start -= 1
+    trailing_number_match = _NUMBER_RE.fullmatch(text, start, end)
+    while not trailing_number_match and start < end:
+        start += 1
+        trailing_number_match = _NUMBER_RE.fullmatch(text, start, end)
+
+    quoted_number = None
+    if not trailing_number_match and end and text[end - 1] == '"':
+        opening_quote = text.rfind('"', 0, end - 1)
+        if opening_quote != -1 and _NUMBER_RE.fullmatch(text, opening_quote + 1, end - 1):
+            before_quote = opening_quote
+            while before_quote and text[before_quote - 1].isspace():
+                before_quote -= 1
+            if before_quote and text[before_quote - 1] == ",":
+                quoted_number = text[opening_quote + 1:end - 1]
+
+    if trailing_number_match or quoted_number is not None:
+        # Both need a "TOTAL:" label somewhere; it is usually on the line the item table ended at
+        has_total_label = (item_section_end_line_index < len(lines)
+                           and "TOTAL:" in lines[item_section_end_line_index]) \
+                          or _TOTAL_LABEL_RE.search(text) is not None
+        if has_total_label:
+            number = trailing_number_match.group(0) if trailing_number_match else quoted_number
+            return number.strip().replace(",", "")
+
+    # Final fallback for Total Amount if not found in specific TOTAL: patterns
+    match_grand_total = _GRAND_TOTAL_RE.search(text)
+    if match_grand_total:
+        return match_grand_total.group(1).strip().replace(",", "")
+    return ""
+
+# Item table patterns. The item parser tokenizes each line once, so its cost
+# grows linearly with the size of the item table.
+_ITEM_ROW_START_RE = re.compile(r"(\d+)") # SI. No. at the start of a row's first line
+# Group 1 is a token of the numeric columns: an amount, quantity or tax rate
+# (digits, optionally after ₹ or before %) or the tax type (capital letters).
+# Any other text is matched without a group and ends the current run of
+# column tokens; whitespace, line breaks included, does not.
+_ITEM_COLUMN_TOKEN_RE = re.compile(r"(₹?\d[\d,]*(?:\.\d+)?%?|[A-Z]+)|[^\s\d₹A-Z]+|₹")
+_ITEM_COLUMN_COUNT = 7
+# The numeric columns of a row, matched against its last seven column tokens joined by spaces
+_ITEM_COLUMNS_RE = re.compile(
+    r'(?:₹)?([\d,]+\.?\d+) '                          # Unit Price
+    r'(\d+) '                                         # Quantity
+    r'(?:₹)?([\d,]+\.?\d+) '                          # Net Amount
+    r'([\d.]+%?) '                                    # Tax Rate (e.g., "9%", "12.0%", optional %)
+    r'([A-Z]+) '                                      # Tax Type (e.g., "CGST", "IGST")
+    r'(?:₹)?([\d,]+\.?\d+) '                          # Tax Amount
+    r'(?:₹)?([\d,]+\.?\d+)'                           # Total Item Price
+)
+# Second tax line of an intra-state item, e.g. "9%SGST₹5,712.71"
+_TAX_ONLY_LINE_RE = re.compile(r"[\d.]+%\s*[A-Z]+\s*(?:₹)?[\d,]+\.?\d+")
+
+def _iter_item_rows(item_lines):
+    """
+    Assembles item rows from the stripped lines of the item table.
+
+    Each line is tokenized once. Outside a row, a line starting with digits
+    (the SI. No.) opens a row, unless it is a lone tax line like
+    "9%SGST₹5,712.71". Inside a row, the column tokens are collected across
+    lines, and the row closes at the end of the line where the last seven
+    consecutive ones are the numeric columns (unit price, qty, net amount,
+    tax rate, tax type, tax amount, total). The columns may wrap onto
+    several lines; the text before them is the description. A unit price
+    with more than two decimal places is read as the price followed by the
+    quantity, as in "₹63,474.581₹63,474.58". A row that is still open when
+    the lines run out is skipped with a warning.
+
+    Yields:
+        tuple: (SI. No., description, unit price, quantity, net amount,
+               tax rate, tax type, tax amount, total item price) as strings,
+               the description possibly spanning several lines.
+    """
+    si_no = None
+    row_lines = []
+    # (index in row_lines, start in that line, text) of the latest consecutive column tokens
+    columns = collections.deque(maxlen=_ITEM_COLUMN_COUNT)
+    for line in item_lines:
+        if si_no is None:
+            if _TAX_ONLY_LINE_RE.fullmatch(line):
+                continue
+            start_match = _ITEM_ROW_START_RE.match(line)
+            if not start_match:
+                continue
+            si_no = start_match.group(1)
+            line = line[start_match.end():]
+            token_start = 1 # The description is at least one character long
+        else:
+            token_start = 0
+
+        row_line_index = len(row_lines)
+        row_lines.append(line)
+        ends_with_column = False
+        for token in _ITEM_COLUMN_TOKEN_RE.finditer(line, token_start):
+            if token.group(1) is None:
+                columns.clear()
+                ends_with_column = False
+            else:
+                column = token.group(1)
+                decimal_point = column.find(".")
+                if decimal_point != -1 and len(column) - decimal_point > 3 and column[-1].isdecimal():
+                    # A unit price with the quantity run into it, e.g. "₹63,474.581₹63,474.58"
+                    quantity_start = decimal_point + 3
+                    columns.append((row_line_index, token.start(), column[:quantity_start]))
+                    columns.append((row_line_index, token.start() + quantity_start, column[quantity_start:]))
+                else:
+                    columns.append((row_line_index, token.start(), column))
+                ends_with_column = token.end() == len(line)
+        if not ends_with_column or len(columns) < _ITEM_COLUMN_COUNT:
+            continue
+        columns_match = _ITEM_COLUMNS_RE.fullmatch(" ".join(text for _, _, text in columns))
+        if not columns_match:
+            continue
+
+        first_line_index, first_start, _ = columns[0]
+        description_lines = row_lines[:first_line_index]
+        description_lines.append(row_lines[first_line_index][:first_start])
+        yield (si_no, "\n".join(description_lines)) + columns_match.groups()
+        si_no = None
+        row_lines = []
+        columns.clear()
+
+    if si_no is not None:
+        logger.warning("Item row %s has no complete price, quantity and tax columns; it was skipped.", si_no)
+
+# Header and item-table patterns, compiled once instead of on every invoice
+_INVOICE_NUMBER_RE = re.compile(r"(?:Invoice Number|Invoice Details):\s*([A-Z0-9-]+)", re.IGNORECASE)
+_ORDER_ID_RE = re.compile(r"(?:Order Number|Order ID):\s*([A-Z0-9-]+)", re.IGNORECASE)
+_INVOICE_DATE_RE = re.compile(r"(?:Invoice Date|Order Date):\s*(\d{2}\.\d{2}\.\d{4})", re.IGNORECASE)
+# Column headers for values, e.g. "AmountTax RateTax TypeTax AmountTotal Amount"
+_VALUE_HEADER_RE = re.compile(r'\bAmount\b.*\bTax\b.*\bTotal\b', re.IGNORECASE)
+# A line that looks like an item: a SI. No., descriptive text, then a price
+# like '63,474.58' or '₹29,463.39'.
+_ITEM_ROW_INDICATOR_RE = re.compile(r'^\s*\d+\s*.+?(?:₹)?[\d,]+\.?\d+', re.IGNORECASE | re.DOTALL)
 
 def parse_amazon_invoice(text):
     """
@@ -11,60 +196,50 @@ def parse_amazon_invoice(text):
         text (str): The full raw text extracted from an Amazon PDF invoice.
 
     Returns:
-        dict: A dictionary containing the extracted invoice data.
-              Returns an empty dictionary if no key data (like Invoice Number) is found.
-              Example:
-              {
-                  "Invoice Number": "AMZ-INV-12345",
-                  "Order ID": "ORD-AMZ-XYZ",
-                  "Invoice Date": "01/01/2023",
-                  "Total Amount": "1500.75",
-                  "Items": [
-                      {"Description": "...", "Quantity": ..., "Unit Price": ..., "Total Item Price": ...},
-                      ...
-                  ]
-              }
+        Invoice: The extracted invoice data, with an empty invoice_type.
+                 Returns None if no key data (like Invoice Number) is found.
+                 Example:
+                 Invoice(invoice_number="AMZ-INV-12345",
+                         order_id="ORD-AMZ-XYZ",
+                         invoice_date="01-01-2023",
+                         total_amount=1500.75,
+                         items=[LineItem(description="...", quantity=..., unit_price=..., total_item_price=...), ...])
     """
-    data = {
-        "Invoice Number": "",
-        "Order ID": "",
-        "Invoice Date": "",
-        "Total Amount": "",
-        "Items": []
-    }
+    data = Invoice()
 
     # --- Section 1: Extract Header Information (Invoice Number, Order ID, Date) ---
     # Invoice Number: Look for patterns like "Invoice Number: ABC-123" or "Invoice Details: ABC-123"
-    match_invoice_num = re.search(r"(?:Invoice Number|Invoice Details):\s*([A-Z0-9-]+)", text, re.IGNORECASE)
+    match_invoice_num = _INVOICE_NUMBER_RE.search(text)
     if match_invoice_num:
-        data["Invoice Number"] = match_invoice_num.group(1).strip()
-    print(f"DEBUG_HEADER: Invoice Number found: {data['Invoice Number']}")
+        data.invoice_number = match_invoice_num.group(1).strip()
+    logger.debug("Invoice Number found: %s", data.invoice_number)
 
     # Order ID: Look for patterns like "Order Number: 123-ABC-456"
-    match_order_id = re.search(r"(?:Order Number|Order ID):\s*([A-Z0-9-]+)", text, re.IGNORECASE)
+    match_order_id = _ORDER_ID_RE.search(text)
     if match_order_id:
-        data["Order ID"] = match_order_id.group(1).strip()
-    print(f"DEBUG_HEADER: Order ID found: {data['Order ID']}")
+        data.order_id = match_order_id.group(1).strip()
+    logger.debug("Order ID found: %s", data.order_id)
 
     # Invoice Date: Look for patterns like "Invoice Date: DD.MM.YYYY" or "Order Date: DD.MM.YYYY"
-    match_invoice_date = re.search(r"(?:Invoice Date|Order Date):\s*(\d{2}\.\d{2}\.\d{4})", text, re.IGNORECASE)
+    match_invoice_date = _INVOICE_DATE_RE.search(text)
     if match_invoice_date:
-        data["Invoice Date"] = match_invoice_date.group(1).strip().replace('.', '-') # Normalize to DD-MM-YYYY
-    print(f"DEBUG_HEADER: Invoice Date found: {data['Invoice Date']}")
+        data.invoice_date = match_invoice_date.group(1).strip().replace('.', '-') # Normalize to DD-MM-YYYY
+    logger.debug("Invoice Date found: %s", data.invoice_date)
         
     # --- Section 2: Extract Items Information from the Table ---
-    lines = text.splitlines()
+    # Split, strip and normalize the lines once for all the scans below
+    index = TextIndex(text)
+    lines = index.stripped_lines
     item_section_start_line_index = -1
     item_section_end_line_index = -1
     actual_items_data_start_index = -1 # New index to mark where actual item data starts
 
     # Step 1: Find the main table header line ("Description", "Unit Price", "Qty")
-    for i, line in enumerate(lines):
-        normalized_line = " ".join(line.split()).lower()
+    for i, normalized_line in enumerate(index.iter_normalized_lines()):
         if ("description" in normalized_line and "unit price" in normalized_line and "qty" in normalized_line):
             item_section_start_line_index = i
             break
-    print(f"DEBUG_ITEM_SECTION: Main item table header found at index: {item_section_start_line_index}")
+    logger.debug("Main item table header found at index: %s", item_section_start_line_index)
 
     if item_section_start_line_index != -1:
         # Step 2: Find the "value header" row (e.g., "AmountTax RateTax TypeTax AmountTotal Amount")
@@ -72,9 +247,9 @@ def parse_amazon_invoice(text):
         # This loop starts from the line *after* the main header.
         sub_header_found_index = -1
         for i in range(item_section_start_line_index + 1, len(lines)):
-            line_clean = lines[i].strip()
+            line_clean = lines[i]
             # This pattern targets lines that look like column headers for values (e.g., "AmountTax RateTax...")
-            if re.search(r'\bAmount\b.*\bTax\b.*\bTotal\b', line_clean, re.IGNORECASE):
+            if _VALUE_HEADER_RE.search(line_clean):
                 sub_header_found_index = i
                 break
             # If we hit a blank line after the main header, keep searching for the sub-header
@@ -90,18 +265,13 @@ def parse_amazon_invoice(text):
             # from the line directly after the main header.
             # We'll use a more robust check for actual item rows.
             
-            # Regex to identify a line that looks like an item:
-            # Starts with optional whitespace, then a number (for SI. No.), followed by descriptive text,
-            # then a price-like string (e.g., '63,474.58' or '₹29,463.39').
-            item_row_indicator_pattern = re.compile(
-                r'^\s*\d+\s*.+?(?:₹)?[\d,]+\.?\d+', re.IGNORECASE | re.DOTALL
-            )
+            # Look for a line that looks like an item (_ITEM_ROW_INDICATOR_RE)
             found_first_item_heuristic = False
             for i in range(item_section_start_line_index + 1, len(lines)):
-                line_clean = lines[i].strip()
+                line_clean = lines[i]
                 if not line_clean: # Skip empty lines
                     continue
-                if item_row_indicator_pattern.search(line_clean):
+                if _ITEM_ROW_INDICATOR_RE.search(line_clean):
                     actual_items_data_start_index = i
                     found_first_item_heuristic = True
                     break
@@ -116,11 +286,11 @@ def parse_amazon_invoice(text):
             if not found_first_item_heuristic and actual_items_data_start_index == -1:
                 actual_items_data_start_index = item_section_start_line_index + 1 # Final fallback
 
-    print(f"DEBUG_ITEM_SECTION: Actual item data start index: {actual_items_data_start_index}")
+    logger.debug("Actual item data start index: %s", actual_items_data_start_index)
 
     # Step 3: Find the end of the item section (e.g., "TOTAL:", "Amount in Words")
     for i in range(actual_items_data_start_index if actual_items_data_start_index != -1 else 0, len(lines)):
-        line_clean = lines[i].strip()
+        line_clean = lines[i]
         if "TOTAL:" in line_clean or "Amount in Words" in line_clean or "Subtotal" in line_clean or "Shipping Address" in line_clean:
             item_section_end_line_index = i
             break
@@ -128,41 +298,23 @@ def parse_amazon_invoice(text):
     if item_section_end_line_index == -1:
         item_section_end_line_index = len(lines) # Fallback if no clear end
     
-    print(f"DEBUG_ITEM_SECTION: Item section end line index: {item_section_end_line_index}")
+    logger.debug("Item section end line index: %s", item_section_end_line_index)
 
     item_table_block_text = ""
     if actual_items_data_start_index != -1 and item_section_end_line_index != -1 and \
        actual_items_data_start_index < item_section_end_line_index:
-        cleaned_lines = [line.strip() for line in lines[actual_items_data_start_index : item_section_end_line_index]]
+        cleaned_lines = lines[actual_items_data_start_index : item_section_end_line_index]
         item_table_block_text = "\n".join(cleaned_lines)
-    print(f"DEBUG_ITEM_SECTION: Item table block text (first 500 chars):\n{item_table_block_text[:500]}...")
+    logger.debug("Item table block text (first 500 chars):\n%s...", item_table_block_text[:500])
     
     if item_table_block_text:
-        # Revised item_line_pattern for flexible parsing based on observed Amazon formats
-        # This pattern is more robust to spaces, newlines within logical fields, and varied column content.
-        # It assumes the "Description", "Unit Price", "Qty", "Net Amount", "Tax Rate", "Tax Type", "Tax Amount", "Total Amount" structure.
-        # It will try to capture the main fields, allowing for flexible content in between.
-        
-        item_line_pattern = re.compile(
-            r'^\s*(\d+)\s*'                                   # G1: SI. No. (starts with a digit, e.g., '1')
-            r'(.+?)'                                          # G2: Description (non-greedy, captures anything until next specific pattern)
-            r'(?:₹)?([\d,]+\.?\d+)\s*'                        # G3: Unit Price
-            r'(\d+)\s*'                                       # G4: Quantity
-            r'(?:₹)?([\d,]+\.?\d+)\s*'                        # G5: Net Amount
-            r'([\d.]+%?)\s*'                                  # G6: Tax Rate (e.g., "9%", "12.0%", optional %)
-            r'([A-Z]+)\s*'                                    # G7: Tax Type (e.g., "CGST", "IGST")
-            r'(?:₹)?([\d,]+\.?\d+)\s*'                        # G8: Tax Amount
-            r'(?:₹)?([\d,]+\.?\d+)$'                          # G9: Total Item Price (ends line)
-        , re.DOTALL | re.MULTILINE) # DOTALL allows . to match newlines, MULTILINE for ^ and $
-
-        all_item_matches = item_line_pattern.findall(item_table_block_text)
-        print(f"DEBUG_ITEM_PARSING: Number of item matches found: {len(all_item_matches)}")
+        all_item_matches = list(_iter_item_rows(cleaned_lines))
+        logger.debug("Number of item matches found: %s", len(all_item_matches))
 
         for idx, match in enumerate(all_item_matches):
-            print(f"DEBUG_ITEM_PARSING: Raw match for item {idx+1}: {match}")
+            logger.debug("Raw match for item %s: %s", idx+1, match)
             
-            # Extract and clean values based on new group indices from the pattern
-            # Group indices (adjusted for the new regex):
+            # Extract and clean values based on the fields of the assembled row:
             # G1: SI. No.
             # G2: Description
             # G3: Unit Price
@@ -210,43 +362,99 @@ def parse_amazon_invoice(text):
                 try: total_item_price = float(total_item_price_raw.replace(",", "").replace("₹", ""))
                 except ValueError: pass
             
-            data["Items"].append({
-                "Description": description,
-                "Quantity": quantity,
-                "Unit Price": unit_price,
-                "Total Item Price": total_item_price
-            })
-            print(f"DEBUG_ITEM_PARSING: Parsed item {idx+1}: {data['Items'][-1]}")
-
-    # Extract Total Amount (now handling the CSV-like structure for the TOTAL: line)
-    # Search for the "TOTAL:" line globally in the text
-    total_line_match = re.search(r"TOTAL:\s*.*?(?:₹)?([\d,]+\.?\d*)\s*$", text, re.IGNORECASE | re.DOTALL)
-    if total_line_match:
-        data["Total Amount"] = total_line_match.group(1).strip().replace(",", "")
-    else:
-        # Fallback: if "TOTAL:" line is in a CSV format with values at the end, specifically the last numeric value
-        total_csv_match = re.search(r"TOTAL:.*,\s*(?:\"([\d,]+\.?\d*)\"|([\d,]+\.?\d*))\s*$", text, re.IGNORECASE | re.DOTALL)
-        if total_csv_match:
-            data["Total Amount"] = (total_csv_match.group(1) or total_csv_match.group(2) or "").strip().replace(",", "")
-        else:
-            # Final fallback for Total Amount if not found in specific TOTAL: patterns
-            match_grand_total = re.search(r"(?:Grand Total|Total Amount|Total Price):\s*(?:₹)?\s*([\d,]+\.?\d*)", text, re.IGNORECASE | re.DOTALL)
-            if match_grand_total:
-                data["Total Amount"] = match_grand_total.group(1).strip().replace(",", "")
-    print(f"DEBUG_HEADER: Final Total Amount found: {data['Total Amount']}")
+            data.items.append(LineItem(
+                description=description,
+                quantity=quantity,
+                unit_price=unit_price,
+                total_item_price=total_item_price
+            ))
+            logger.debug("Parsed item %s: %s", idx+1, data.items[-1])
+
+    # Extract Total Amount from the number the document ends with (or a CSV-like TOTAL: line)
+    data.total_amount = parse_amount(_extract_total_amount(text, lines, item_section_end_line_index))
+    logger.debug("Final Total Amount found: %s", data.total_amount)
 
 
-    if not data["Invoice Number"] and not data["Order ID"]:
-        print("DEBUG_FINAL: No Invoice Number or Order ID found. Returning empty dict.")
-        return {} # Return empty dict if no main identifiers are found
+    if not data.invoice_number and not data.order_id:
+        logger.debug("No Invoice Number or Order ID found. Returning None.")
+        return None # Return None if no main identifiers are found
 
-    print(f"DEBUG_FINAL: Successfully parsed data for Invoice Number: {data['Invoice Number']} or Order ID: {data['Order ID']}")
+    logger.debug("Successfully parsed data for Invoice Number: %s or Order ID: %s", data.invoice_number, data.order_id)
     return data
 
+# Every page of an Amazon invoice starts with this header, and its
+# "Page N of M" line tells a continuation page apart from a new invoice.
+_INVOICE_HEADER_RE = re.compile(r"Tax Invoice/Bill of Supply", re.IGNORECASE)
+_PAGE_NUMBER_RE = re.compile(r"Page\s*(\d+)\s*of\s*\d+", re.IGNORECASE)
+
+def split_amazon_invoices(text):
+    """
+    Splits the text of a PDF holding several Amazon invoices (e.g. an Amazon
+    Business bulk download) into one text per invoice.
+
+    A new invoice starts at every "Tax Invoice/Bill of Supply" header, except
+    where the page's "Page N of M" line says N > 1; such a page continues the
+    previous invoice. Text before the first header stays with the first
+    invoice, so a single-invoice PDF comes back as one unchanged text.
+
+    Args:
+        text (str): The full raw text extracted from the PDF.
+
+    Returns:
+        list: The invoice texts, in document order.
+    """
+    header_starts = [match.start() for match in _INVOICE_HEADER_RE.finditer(text)]
+    if len(header_starts) < 2:
+        return [text]
+
+    invoice_texts = []
+    boundaries = [0] + header_starts[1:] + [len(text)]
+    for start, end in zip(boundaries, boundaries[1:]):
+        page_text = text[start:end]
+        page_number_match = _PAGE_NUMBER_RE.search(page_text)
+        if invoice_texts and page_number_match and int(page_number_match.group(1)) > 1:
+            invoice_texts[-1] += page_text
+        else:
+            invoice_texts.append(page_text)
+    logger.debug("Split Amazon document into %s invoice(s).", len(invoice_texts))
+    return invoice_texts
+
+def parse_amazon_invoices(text, invoice_workers=1):
+    """
+    Parses every invoice in the text of an Amazon PDF; see split_amazon_invoices().
+
+    Args:
+        text (str): The full raw text extracted from the PDF.
+        invoice_workers (int): Number of processes used to parse the invoices
+                               concurrently. Results keep the document order.
+
+    Returns:
+        list: A list of Invoice objects as returned by parse_amazon_invoice(),
+              one per invoice that yielded data, the same shape
+              parse_flipkart_invoice() returns.
+    """
+    invoice_texts = split_amazon_invoices(text)
+    if invoice_workers > 1 and len(invoice_texts) > 1:
+        max_workers = min(invoice_workers, len(invoice_texts))
+        logger.debug("Parsing %s invoices with %s processes.", len(invoice_texts), max_workers)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_logging,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+            parsed_invoices = list(executor.map(parse_amazon_invoice, invoice_texts,
+                                                chunksize=max(1, len(invoice_texts) // (max_workers * 4))))
+    else:
+        parsed_invoices = [parse_amazon_invoice(invoice_text) for invoice_text in invoice_texts]
+    return [parsed_data for parsed_data in parsed_invoices if parsed_data]
+
+# Text that identifies a Amazon document for vendor detection (matched case-insensitively)
+VENDOR_FINGERPRINTS = ("amazon.in", "amazon seller services")
+register_vendor("Amazon", VENDOR_FINGERPRINTS, parse_amazon_invoices, version=PARSER_VERSION)
+
 # This block allows you to test the extract_amazon.py script independently.
 if __name__ == "__main__":
     import os
     import sys
+
+    configure_logging(logging.DEBUG)
     
     script_dir = os.path.dirname(__file__)
     project_root = os.path.abspath(os.path.join(script_dir, '..'))
@@ -282,17 +490,19 @@ if __name__ == "__main__":
                 print(extracted_text[:1000])
                 print("...")
                 
-                parsed_data = parse_amazon_invoice(extracted_text)
+                all_parsed_amazon_data = parse_amazon_invoices(extracted_text)
                 
                 print("\n--- Parsed Amazon Invoice Data ---")
-                if parsed_data:
-                    for key, value in parsed_data.items():
-                        if key == "Items":
-                            print(f"{key}:")
-                            for item in value:
-                                print(f"  - {item}")
-                        else:
-                            print(f"{key}: {value}")
+                if all_parsed_amazon_data:
+                    for idx, parsed_data in enumerate(all_parsed_amazon_data):
+                        print(f"\n----- Invoice {idx + 1} -----")
+                        for key, value in parsed_data.to_dict().items():
+                            if key == "Items":
+                                print(f"{key}:")
+                                for item in value:
+                                    print(f"  - {item}")
+                            else:
+                                print(f"{key}: {value}")
                 else:
                     print("No Amazon invoice data was successfully parsed. Check the PDF content and parsing logic.")
             else:
@@ -1,91 +1,488 @@
 import re
+import logging
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
+from regex_backend import compile_pattern, search_with_budget, RegexTimeout
+from vendor_detector import register_vendor
+from text_index import TextIndex
+from invoice_models import Invoice, LineItem, parse_amount
+from log_config import configure_logging
+
+# Bump this whenever a parsing change can alter the extracted data, so the
+# run manifest reprocesses PDFs that were parsed by an older version.
+PARSER_VERSION = "4"
+
+logger = logging.getLogger(__name__)
+
+# Lines that are *definitely* not item data: general document structure and
+# column headers that are *not* part of a numerical item row.
+_NON_ITEM_LINE_PATTERNS = [
+    r"E\. & O\.E\. page",
+    r"Billing Address",
+    r"Phone: xxxxxxxxxx",
+    r"Order ID:",
+    r"Order Date:",
+    r"Invoice Date:",
+    r"PAN:",
+    r"CIN:",
+    r"Invoice Number",
+    r"Sold By:",
+    r"Ship-from Address:",
+    r"GSTIN",
+    r"Description\s+Qty\s+Gross\s+Amount", # This is the main item table header
+    r"Signature",
+    r"Authorized Signatory",
+    r"Regd\. office:",
+    r"Contact Flipkart:",
+    r"www\.flipkart\.com",
+    r"Total\s+items:", # Summary total line
+    r"Grand Total\s*₹", # Summary total line
+    r"Payment Details",
+    r"Handsets\s*$", # Specific category header line, ends with Handsets
+    # General column headers without values that should be skipped if they appear alone
+    r"^\s*Amount\s*₹Discounts\s*$",
+    r"^\s*/Coupons\s*₹Taxable\s*$",
+    r"^\s*value\s*₹CGST\s*$",
+    r"^\s*₹SGST\s*$",
+    r"^\s*/UTGST\s*$",
+    r"^\s*₹Total\s*₹\s*$",
+    r"^\s*Value\s*₹Total\s*₹\s*$",
+    r"^\s*Value\s*₹IGST\s*$",
+    r"^\s*₹IGST\s*$",
+]
+# One compiled alternation, so classifying a line is a single regex search
+# instead of one search per pattern.
+_NON_ITEM_LINE_RE = compile_pattern("|".join(f"(?:{pattern})" for pattern in _NON_ITEM_LINE_PATTERNS), re.IGNORECASE)
+
+# The overall "Total" sums. This needs to be precise so it does not match lines
+# that are part of an item description but contain a total.
+_TOTAL_SUMMARY_LINE_RE = compile_pattern(r"^\s*Total\s+\d+\s+([-]?[\d,.-]+)\s+([\d,.-]+)\s+([\d,.-]+)\s+([\d,.-]+)\s+([\d,.-]+)\s+([-]?[\d,]+\.\d{2})$")
+_ITEM_START_LINE_RE = compile_pattern(r"^(?:FSN:|HSN/SAC:|SAC:\s*\d+|Shipping And Handling Charges|Product Exchange|Digital Voucher Code)\b", re.IGNORECASE)
+_NUMERIC_ROW_START_RE = compile_pattern(r"^\d+\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}") # Qty Amount Discount pattern
+
+# Item-matching patterns, compiled once. Each is tried against a multi-line item block.
+_FREIGHT_CHARGE_RE = compile_pattern(
+    r"^(?:SAC:\s*(\d+)\s*)?" # Optional SAC number (Group 1)
+    r"(Freight charges for pick up of(?:\s*\nused product)?)\s*" # Description (Group 2)
+    r"(?:\d+\.\d+\s*%\s*CGST:\s*)?"
+    r"(?:\d+\.\d+\s*%\s*SGST/UTGST:\s*)?"
+    r"(\d+)\s*" # Quantity (Group 3)
+    r"([-]?[\d,]+\.\d{2})\s*" # Gross Amount (Group 4)
+    r"([-]?[\d,]+\.\d{2})\s*" # Discounts (Group 5)
+    r"([-]?[\d,]+\.\d{2})\s*" # Taxable (Group 6)
+    r"([-]?[\d,]+\.\d{2})\s*" # CGST (Group 7)
+    r"([-]?[\d,]+\.\d{2})\s*" # SGST (Group 8)
+    r"([-]?[\d,]+\.\d{2})$", # Total (Group 9)
+    re.IGNORECASE | re.DOTALL
+)
+_SECURE_PACKAGING_FEE_RE = compile_pattern(
+    r"^(?:SAC:\s*(\d+)\s*)?" # Optional SAC number (Group 1)
+    r"(Secure Packaging Fee(?:\s*1\.\s*\[IMEI/Serial No:\s*\]\s*([\d\s]+))?)\s*" # Description (Group 2), IMEI (Group 3)
+    r"(?:\d+\.\d+\s*%\s*CGST:\s*)?"
+    r"(?:\d+\.\d+\s*%\s*SGST/UTGST:\s*)?"
+    r"(\d+)\s*" # Quantity (Group 4)
+    r"([-]?[\d,]+\.\d{2})\s*" # Gross Amount (Group 5)
+    r"([-]?[\d,]+\.\d{2})\s*" # Discounts (Group 6)
+    r"([-]?[\d,]+\.\d{2})\s*" # Taxable (Group 7)
+    r"([-]?[\d,]+\.\d{2})\s*" # CGST (Group 8)
+    r"([-]?[\d,]+\.\d{2})\s*" # SGST (Group 9)
+    r"([-]?[\d,]+\.\d{2})$", # Total (Group 10)
+    re.IGNORECASE | re.DOTALL
+)
+_PRODUCT_EXCHANGE_RE = compile_pattern(
+    r"^(Product Exchange)\s*\n" # G1: "Product Exchange" header
+    r"FSN:\s*([A-Z0-9]+)\s*\n" # G2: FSN
+    r"HSN/SAC:\s*(\d+)(?:Exchange of\s*)?" # G3: HSN/SAC, optional "Exchange of"
+    r"([\s\S]+?)(?:\s*Total\s+\d+\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2})?\s*\n" # G4: Product Name (non-greedy), followed by optional internal Total line, and newline
+    r"(\d+)\s+" # G5: Quantity
+    r"([-]?[\d,]+\.\d{2})\s+" # G6: Gross Amount
+    r"([-]?[\d,]+\.\d{2})\s+" # G7: Discounts
+    r"([-]?[\d,]+\.\d{2})\s+" # G8: Taxable Value
+    r"(?:([-]?[\d,]+\.\d{2})\s+)?" # G9: CGST (Optional)
+    r"(?:([-]?[\d,]+\.\d{2})\s+)?" # G10: SGST/UTGST (Optional)
+    r"([-]?[\d,]+\.\d{2})$", # G11: Total Item Price for THIS item
+    re.IGNORECASE | re.DOTALL
+)
+_SPOTIFY_PREMIUM_RE = compile_pattern(
+    r"^(Digital Voucher Code)\s*\n" # G1: "Digital Voucher Code" header
+    r"FSN:\s*([A-Z0-9]+)\s*\n" # G2: FSN
+    r"HSN/SAC:\s*(\d+)(Spotify Premium - \d+M at Rs \d+)[^\S\n]*\n\s*" # G3: HSN/SAC, G4: Spotify description
+    r"(?:18\.0\s*%\s*IGST:\s*)?" # Optional IGST label
+    r"(\d+)\s+" # G5: Quantity (should be 1)
+    r"([-]?[\d,]+\.\d{2})\s+" # G6: Gross Amount
+    r"([-]?[\d,]+\.\d{2})\s+" # G7: Discounts
+    r"([-]?[\d,]+\.\d{2})\s+" # G8: Taxable Value
+    r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G9: IGST (Optional)
+    r"([-]?[\d,]+\.\d{2})\s*\n" # G10: Total Item Price for THIS item
+    r"(?:Total\s*\d+\s*[-]?[\d,]+\.\d{2}\s*[-]?[\d,]+\.\d{2}\s*[-]?[\d,]+\.\d{2}\s*[-]?[\d,]+\.\d{2})?$", # Optional summary "Total" line for this sub-section
+    re.IGNORECASE | re.DOTALL
+)
+_SHIPPING_AND_HANDLING_RE = compile_pattern(
+    r"^(Shipping And Handling Charges)\s*" # Description (Group 1)
+    r"(\d+)\s*" # Quantity (Group 2)
+    r"([-]?[\d,]+\.\d{2})\s*" # Gross Amount (Group 3)
+    r"([-]?[\d,]+\.\d{2})\s*" # Discounts (Group 4)
+    r"([-]?[\d,]+\.\d{2})\s*" # Taxable (Group 5)
+    r"([-]?[\d,]+\.\d{2})\s*" # CGST (Group 6)
+    r"([-]?[\d,]+\.\d{2})\s*" # SGST (Group 7)
+    r"([-]?[\d,]+\.\d{2})$", # Total (Group 8)
+    re.IGNORECASE | re.DOTALL
+)
+# Where a standard product description ends: the quantity/price columns or
+# the IMEI, warranty and box-contents lines that follow it
+_STANDARD_DESCRIPTION_STOP = r"\d+\s+[-]?[\d,]+\.\d{2}|1\.\s*\[IMEI/Serial No:|Warranty:|Phone and 6 Months Warranty"
+_STANDARD_PRODUCT_RE = compile_pattern(
+    r"^(?!Total\s+\d+|Grand Total\s*₹|SAC:\s*\d+\s*(?:Freight|Secure)|Product Exchange|Digital Voucher Code|Shipping And Handling Charges)\s*" # Negative lookahead for total/known specific item start lines
+    # No two whitespace-consuming pieces may sit next to each other: each extra
+    # way to split a whitespace run between them multiplies the backtracking,
+    # and a block without a trailing total used to run for minutes. So every
+    # piece below starts with a non-space character (a "\n" it needs is checked
+    # with a lookbehind) and owns the whitespace that follows it.
+    r"(?:FSN:\s*([A-Z0-9]+)[^\S\n]*\n\s*)?" # G1: FSN (Optional)
+    r"(?:HSN/SAC:\s*(\d+)\s*)?" # G2: HSN/SAC (Optional)
+    # G3: Main product description, multi-line, non-greedy. It starts and ends
+    # with a non-space character and stops before quantity/price or other
+    # structured data.
+    r"((?:(?!" + _STANDARD_DESCRIPTION_STOP + r")\S(?:\s*(?!" + _STANDARD_DESCRIPTION_STOP + r")\S)*?)??)"
+    r"(?:(?<=\S)\s*|(?<!\S))" # Whitespace after the description, unless already consumed
+    r"(?:(?<=\n)1\.\s*\[IMEI/Serial No:\s*([\d\s]+)\]\s*)?" # G4: IMEI (Optional)
+    r"(?:(?<=\n)Warranty:.*?)?" # Non-capturing optional warranty
+    r"(?:(?<=\n)Phone and 6 Months Warranty for In the Box(?:\s*(?<=\n)Accessories)?)?" # Non-capturing specific warranty lines
+    r"(?:(?:(?<=\S)\s*|(?<!\S))\d+\.\d+\s*%\s*(?:CGST|SGST/UTGST|IGST):\s*)?" # Non-capturing tax rate lines (label only)
+    r"(\d+)\s*" # G5: Quantity
+    r"([-]?[\d,]+\.\d{2})\s*" # G6: Gross Amount
+    r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G7: Discounts (Optional)
+    r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G8: Taxable Value (Optional)
+    r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G9: CGST (Optional)
+    r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G10: SGST/UTGST (Optional)
+    r"([-]?[\d,]+\.\d{2})$", # G11: Total
+    re.IGNORECASE | re.DOTALL
+)
+
+# Cleanup patterns used by the item builders
+_WHITESPACE_RUN_RE = compile_pattern(r"\s+")
+_EXCHANGE_NAME_NOISE_RE = compile_pattern(r"([\d,]+\.\d{2}(?:\s*[-]?[\d,]+\.\d{2})*|Total(?:\s+\d+)?(?:\s*[-]?[\d,]+\.\d{2})*)", re.IGNORECASE)
+_EXCHANGE_SPORT_SUFFIX_RE = compile_pattern(r"Sport(?:1)?$", re.IGNORECASE)
+_DESCRIPTION_IMEI_RE = compile_pattern(r"1\.\s*\[IMEI/Serial No:\s*[\d\s]+\]", re.IGNORECASE | re.DOTALL)
+_DESCRIPTION_WARRANTY_RE = compile_pattern(r"Warranty:.*$", re.IGNORECASE | re.DOTALL)
+_DESCRIPTION_BOX_CONTENTS_RE = compile_pattern(r"Phone and 6 Months Warranty for In the Box(?:Accessories)?", re.IGNORECASE | re.DOTALL)
+_DESCRIPTION_TAX_LABEL_RE = compile_pattern(r"\s*\d+\.\d+\s*%\s*(?:CGST:|SGST/UTGST:|IGST:)?", re.IGNORECASE)
+_DESCRIPTION_COLUMN_HEADER_RE = compile_pattern(r"Amount ₹Discounts|/Coupons ₹Taxable|value ₹CGST|₹SGST|/UTGST|₹Total ₹|Value ₹IGST|Value ₹Total ₹|Handsets|Accessories", re.IGNORECASE)
+_DESCRIPTION_FSN_HSN_RE = compile_pattern(r"(?:FSN:\s*[A-Z0-9]+|HSN/SAC:\s*\d+)\s*", re.IGNORECASE)
+_DESCRIPTION_AMOUNTS_RE = compile_pattern(r"([\d,]+\.\d{2}(?:\s*[-]?[\d,]+\.\d{2})*|\s*Total(?:\s*\d+)?(?:\s*[-]?[\d,]+\.\d{2})*)", re.IGNORECASE)
+_LONG_NUMBER_RE = compile_pattern(r"\b\d{10,}\b")
+
+# Builders turning a match of the item pattern of the same name into a LineItem
+def _build_freight_charge_item(match):
+    desc_parts = []
+    if match.group(1): # Add SAC if present
+        desc_parts.append(f"SAC: {match.group(1).strip()}")
+    desc_parts.append(match.group(2).strip().replace('\n', ' '))
+    desc = " ".join(part for part in desc_parts if part)
+    desc = _WHITESPACE_RUN_RE.sub(' ', desc).strip()
+    return LineItem(
+        description=desc,
+        quantity=int(match.group(3)),
+        unit_price=float(match.group(4).replace(",", "")),
+        total_item_price=float(match.group(9).replace(",", ""))
+    )
+
+def _build_secure_packaging_fee_item(match):
+    desc_parts = []
+    if match.group(1): # SAC number
+        desc_parts.append(f"SAC: {match.group(1).strip()}")
+
+    # Combine the base description and IMEI if present
+    base_desc = "Secure Packaging Fee"
+    if match.group(3): # IMEI was captured
+        base_desc += f" 1. [IMEI/Serial No: ] {match.group(3).strip()}"
+
+    desc_parts.append(base_desc)
+
+    desc = " ".join(part for part in desc_parts if part)
+    desc = _WHITESPACE_RUN_RE.sub(' ', desc).strip()
+
+    return LineItem(
+        description=desc,
+        quantity=int(match.group(4)),
+        unit_price=float(match.group(5).replace(",", "")),
+        total_item_price=float(match.group(10).replace(",", ""))
+    )
+
+def _build_product_exchange_item(match):
+    product_name_raw = match.group(4).strip().replace('\n', ' ')
+    # Remove any numbers or "Total" from the product name if they were accidentally captured
+    product_name_cleaned = _EXCHANGE_NAME_NOISE_RE.sub('', product_name_raw).strip()
+    product_name_cleaned = _EXCHANGE_SPORT_SUFFIX_RE.sub('', product_name_cleaned).strip() # Remove "Sport" if it's there
+    product_name_cleaned = _WHITESPACE_RUN_RE.sub(' ', product_name_cleaned).strip() # Compact spaces
+
+    final_desc_parts = ["Product Exchange"]
+    final_desc_parts.append(f"FSN: {match.group(2).strip()}")
+    final_desc_parts.append(f"HSN/SAC: {match.group(3).strip()}")
+    final_desc_parts.append(product_name_cleaned) # Use the cleaned product name
+
+    final_desc = " ".join(part for part in final_desc_parts if part).strip()
+    final_desc = _WHITESPACE_RUN_RE.sub(' ', final_desc).strip()
+
+    return LineItem(
+        description=final_desc,
+        quantity=int(match.group(5)), # Quantity
+        unit_price=float(match.group(6).replace(",", "")), # Gross Amount
+        total_item_price=float(match.group(11).replace(",", "")) # Total Item Price
+    )
+
+def _build_spotify_premium_item(match):
+    desc_parts = ["Digital Voucher Code"]
+    if match.group(2): # FSN
+        desc_parts.append(f"FSN: {match.group(2).strip()}")
+    # Note: HSN/SAC and Spotify description are captured together in G3 and G4,
+    # as '998599Spotify Premium - 12M at Rs 699' is one string.
+    # So we combine them.
+    if match.group(3) and match.group(4):
+        desc_parts.append(f"HSN/SAC: {match.group(3).strip()} {match.group(4).strip()}")
+    elif match.group(3): # Fallback if G4 is empty
+         desc_parts.append(f"HSN/SAC: {match.group(3).strip()}")
+
+    final_desc = " ".join(part for part in desc_parts if part).replace('\n', ' ')
+    final_desc = _WHITESPACE_RUN_RE.sub(' ', final_desc).strip()
+
+    return LineItem(
+        description=final_desc,
+        quantity=int(match.group(5)),
+        unit_price=float(match.group(6).replace(",", "")),
+        total_item_price=float(match.group(10).replace(",", ""))
+    )
+
+def _build_shipping_and_handling_item(match):
+    return LineItem(
+        description=match.group(1).strip(),
+        quantity=int(match.group(2)),
+        unit_price=float(match.group(3).replace(",", "")),
+        total_item_price=float(match.group(8).replace(",", ""))
+    )
+
+def _build_standard_product_item(match):
+    full_description_parts = []
+    if match.group(1): # FSN
+        full_description_parts.append(f"FSN: {match.group(1).strip()}")
+    if match.group(2): # HSN/SAC
+        full_description_parts.append(f"HSN/SAC: {match.group(2).strip()}")
+
+    item_desc_core = match.group(3).strip()
+    # Aggressive cleanup for the description
+    item_desc_core = _DESCRIPTION_IMEI_RE.sub('', item_desc_core).strip()
+    item_desc_core = _DESCRIPTION_WARRANTY_RE.sub('', item_desc_core).strip()
+    item_desc_core = _DESCRIPTION_BOX_CONTENTS_RE.sub('', item_desc_core).strip()
+    item_desc_core = _DESCRIPTION_TAX_LABEL_RE.sub('', item_desc_core).strip()
+    item_desc_core = _DESCRIPTION_COLUMN_HEADER_RE.sub('', item_desc_core).strip()
+    item_desc_core = _DESCRIPTION_FSN_HSN_RE.sub('', item_desc_core).strip() # Remove FSN/HSN from description if they leaked
+    item_desc_core = _DESCRIPTION_AMOUNTS_RE.sub('', item_desc_core).strip() # Remove numerical values/totals that might have snuck in
+    item_desc_core = _LONG_NUMBER_RE.sub('', item_desc_core).strip() # Remove long numbers that might be IMEI if not captured by G4
+    item_desc_core = _WHITESPACE_RUN_RE.sub(' ', item_desc_core).strip() # Compact multiple spaces
+
+
+    full_description_parts.append(item_desc_core)
+
+    if match.group(4): # IMEI
+        full_description_parts.append(f"[IMEI/Serial No: {match.group(4).strip()}]")
+
+    final_desc = " ".join(part for part in full_description_parts if part).replace('\n', ' ')
+    final_desc = _WHITESPACE_RUN_RE.sub(' ', final_desc).strip() # Compact multiple spaces
+
+    return LineItem(
+        description=final_desc,
+        quantity=int(match.group(5)),
+        unit_price=float(match.group(6).replace(",", "")),
+        total_item_price=float(match.group(11).replace(",", ""))
+    )
+
+# Item rules, tried in order (most specific first) against each candidate item
+# block. A rule's pattern only runs if the block passes its cheap trigger:
+# "prefix" must start the block and every "keyword" must occur in it (both
+# compared lowercased). Each trigger is text its pattern cannot match without,
+# so it never changes the result. The standard product rule has no trigger and
+# catches whatever the specific rules did not.
+ItemRule = collections.namedtuple("ItemRule", ["name", "prefix", "keywords", "pattern", "build_item"])
+
+# Letters re.IGNORECASE matches against ASCII s/i that str.lower() does not fold
+_TRIGGER_CASE_FOLD = str.maketrans({"ſ": "s", "ı": "i", "İ": "i"})
+
+_ITEM_RULES = (
+    ItemRule("Freight Charge", None, ("freight charges for pick up of",), _FREIGHT_CHARGE_RE, _build_freight_charge_item),
+    ItemRule("Secure Packaging Fee", None, ("secure packaging fee",), _SECURE_PACKAGING_FEE_RE, _build_secure_packaging_fee_item),
+    ItemRule("Spotify Premium", "digital voucher code", ("spotify premium - ",), _SPOTIFY_PREMIUM_RE, _build_spotify_premium_item),
+    ItemRule("Shipping And Handling Charges", "shipping and handling charges", (), _SHIPPING_AND_HANDLING_RE, _build_shipping_and_handling_item),
+    ItemRule("Product Exchange", "product exchange", ("fsn:", "hsn/sac:"), _PRODUCT_EXCHANGE_RE, _build_product_exchange_item),
+    ItemRule("Standard Product", None, (), _STANDARD_PRODUCT_RE, _build_standard_product_item),
+)
+
+def _match_item_block(block):
+    """
+    Runs the first item rule that matches the block.
+
+    Returns:
+        tuple: (LineItem, number of block lines consumed, rule name), or
+               (None, 0, None) if no rule matched.
 
-def _parse_single_flipkart_section(section_text, global_order_id="", global_invoice_date=""):
+    Raises:
+        RegexTimeout: If a pattern exceeded its time budget.
     """
-    Parses a single section of text identified as a Flipkart invoice or note.
-    This helper function contains the core logic for extracting header and item data.
-    It takes global Order ID and Invoice Date as input, which are used as fallbacks.
+    block_lower = block.translate(_TRIGGER_CASE_FOLD).lower()
+    for rule in _ITEM_RULES:
+        if rule.prefix and not block_lower.startswith(rule.prefix):
+            continue
+        if not all(keyword in block_lower for keyword in rule.keywords):
+            continue
+        match = search_with_budget(rule.pattern, block)
+        if match:
+            return rule.build_item(match), len(match.group(0).splitlines()), rule.name
+    return None, 0, None
+
+# Labels assigned to each item-section line by _classify_item_line()
+LINE_OTHER = 0
+LINE_NON_ITEM = 1 # Header, footer, address or column-header line
+LINE_TOTAL_SUMMARY = 2 # "Total <qty> <amounts...>" summary row
+LINE_ITEM_START = 3 # Starts a specific item type (FSN:, SAC:, Product Exchange, ...)
+LINE_NUMERIC_START = 4 # Starts with the numeric Qty/Amount/Discount columns of an item
+
+def _classify_item_line(line):
     """
-    data = {
-        "Invoice Type": "Unknown",
-        "Invoice Number": "",
-        "Order ID": global_order_id,  # Initialize with global value
-        "Invoice Date": global_invoice_date, # Initialize with global value
-        "Total Amount": "",
-        "Items": []
-    }
-
-    lines = section_text.splitlines()
-    
-    # --- Extract Header Information for a Single Section ---
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-
+    Labels a stripped item-section line once, so the item loop and its
+    lookahead can reuse the label instead of re-running the same regexes.
+    """
+    if _NON_ITEM_LINE_RE.search(line):
+        return LINE_NON_ITEM
+    if _TOTAL_SUMMARY_LINE_RE.search(line):
+        return LINE_TOTAL_SUMMARY
+    if _ITEM_START_LINE_RE.search(line):
+        return LINE_ITEM_START
+    if _NUMERIC_ROW_START_RE.search(line):
+        return LINE_NUMERIC_START
+    return LINE_OTHER
+
+# Header patterns. pdf_reader normalizes non-breaking and other exotic spaces
+# to plain spaces, which \s matches, so no pattern needs a separate \xa0 case.
+_ORDER_ID_RE = compile_pattern(r"Order ID:\s*([A-Z0-9]+)")
+_INVOICE_DATE_RE = compile_pattern(r"Invoice Date:\s*(\d{2}-\d{2}-\d{4})")
+_ORDER_DATE_RE = compile_pattern(r"Order Date:\s*(\d{2}-\d{2}-\d{4})")
+_GLOBAL_INVOICE_DATE_RE = compile_pattern(r"(?:Invoice Date:|Order Date:)\s*(\d{2}-\d{2}-\d{4})")
+_GRAND_TOTAL_RE = compile_pattern(r"Grand Total\s*₹\s*([-]?[\d,]+\.\d{2})")
+# Tried in order: "Invoice Number" first, then Debit/Credit Note Numbers
+_INVOICE_NUMBER_RES = (
+    (compile_pattern(r"Invoice Number\s*#?\s*([A-Z0-9-]+?)(?:Tax Invoice|Debit Note|Credit Note)?$", re.IGNORECASE), "Invoice Number"), # Non-greedy capture, then optional suffix
+    (compile_pattern(r"Debit Note Number\s*#?\s*([A-Z0-9-]+?)(?:Debit Note)?$", re.IGNORECASE), "Debit Note Number"),
+    (compile_pattern(r"Credit Note Number\s*#?\s*([A-Z0-9-]+?)(?:Credit Note)?$", re.IGNORECASE), "Credit Note Number"),
+    (compile_pattern(r"Original Invoice Number:\s*([A-Z0-9-]+)", re.IGNORECASE), "Original Invoice Number"),
+)
+_INVOICE_NUMBER_SUFFIX_RE = compile_pattern(r"(tax invoice|debit note|credit note)$", re.IGNORECASE)
+
+# Markers that end the item list of a section ("Total items:", the grand
+# total or the page footer), as one alternation so each line costs one search
+_ITEM_LIST_END_RE = compile_pattern(r"(?i:Total\s+items:)|Grand Total\s*₹|E\.\s*&\s*O\.E\.\s*page")
+
+# Document types named in a section's title line, in order of precedence
+_INVOICE_TYPES = ("Tax Invoice", "Debit Note", "Credit Note")
+
+def _scan_section_header(stripped_lines, data):
+    """
+    Fills the header fields of a section's Invoice (type, Order ID, invoice
+    number, invoice date and total amount) from its stripped lines. data
+    starts out with the global Order ID and Invoice Date as fallbacks.
+
+    Each line is only tested for the fields that are still missing, and the
+    scan stops once none are, so the item rows and footer of a long section
+    are usually never looked at. A field counts as found the first time it
+    matches in the section, even if the value equals the global fallback.
+    The exceptions are an invoice number that is empty once cleaned, and
+    an Order Date. An "Invoice Date:" line takes priority over an
+    "Order Date:" line wherever the two are in the section; the Order Date
+    only stands in until an Invoice Date is found.
+    """
+    missing = {"Invoice Type", "Order ID", "Invoice Number", "Invoice Date", "Total Amount"}
+    has_order_date = False
+    for line_index, line_stripped in enumerate(stripped_lines):
         # Identify Invoice Type (Tax Invoice, Debit Note, Credit Note)
-        if "Tax Invoice" in line_stripped and data["Invoice Type"] == "Unknown":
-            data["Invoice Type"] = "Tax Invoice"
-            # print(f"DEBUG_HEADER: Identified as Tax Invoice from line: {line_stripped}")
-        elif "Debit Note" in line_stripped and data["Invoice Type"] == "Unknown":
-            data["Invoice Type"] = "Debit Note"
-            # print(f"DEBUG_HEADER: Identified as Debit Note from line: {line_stripped}")
-        elif "Credit Note" in line_stripped and data["Invoice Type"] == "Unknown":
-            data["Invoice Type"] = "Credit Note"
-            # print(f"DEBUG_HEADER: Identified as Credit Note from line: {line_stripped}")
-
-        # Order ID: Appears early and consistently, potentially with leading non-breaking space
-        if "Order ID:" in line_stripped:
-            match = re.search(r"Order ID:\s*(\xa0)?([A-Z0-9]+)", line_stripped)
-            if match and data["Order ID"] == global_order_id: # Only update if not already found in section
-                data["Order ID"] = match.group(2).strip()
-                # print(f"DEBUG_HEADER: Found Order ID in section: {data['Order ID']}")
-
-        # Invoice Number/Note Number: More robust patterns and cleaning
-        # Prioritize "Invoice Number" first, then Debit/Credit Note Numbers
-        inv_num_patterns = [
-            (r"Invoice Number\s*#?\s*([A-Z0-9-]+?)(?:Tax Invoice|Debit Note|Credit Note)?$", "Invoice Number"), # Non-greedy capture, then optional suffix
-            (r"Debit Note Number\s*#?\s*([A-Z0-9-]+?)(?:Debit Note)?$", "Debit Note Number"),
-            (r"Credit Note Number\s*#?\s*([A-Z0-9-]+?)(?:Credit Note)?$", "Credit Note Number"),
-            (r"Original Invoice Number:\s*([A-Z0-9-]+)", "Original Invoice Number")
-        ]
-        
-        if not data["Invoice Number"]: # Only try to find if not already set
-            for pattern_str, name_of_field in inv_num_patterns:
-                match = re.search(pattern_str, line_stripped, re.IGNORECASE)
+        if "Invoice Type" in missing:
+            for invoice_type in _INVOICE_TYPES:
+                if invoice_type in line_stripped:
+                    data.invoice_type = invoice_type
+                    missing.discard("Invoice Type")
+                    break
+
+        # Order ID: Appears early and consistently
+        if "Order ID" in missing and "Order ID:" in line_stripped:
+            match = _ORDER_ID_RE.search(line_stripped)
+            if match:
+                data.order_id = match.group(1).strip()
+                missing.discard("Order ID")
+
+        # Invoice Number/Note Number: the first pattern that matches wins
+        if "Invoice Number" in missing and "number" in line_stripped.lower():
+            for pattern, name_of_field in _INVOICE_NUMBER_RES:
+                match = pattern.search(line_stripped)
                 if match:
                     # Clean the suffix if it was captured as part of the ID
-                    inv_id = match.group(1).strip()
-                    # A more explicit cleanup for common suffixes
-                    inv_id = re.sub(r"(tax invoice|debit note|credit note)$", "", inv_id, flags=re.IGNORECASE).strip()
-                    data["Invoice Number"] = inv_id
-                    # print(f"DEBUG_HEADER: Found {name_of_field}: {data['Invoice Number']}")
-                    break # Stop after finding the first relevant invoice number
-
-        # Invoice Date: Capture DD-MM-YYYY, accounting for leading non-breaking space
-        if "Invoice Date:" in line_stripped:
-            match = re.search(r"Invoice Date:\s*(\xa0)?(\d{2}-\d{2}-\d{4})", line_stripped)
-            if match and data["Invoice Date"] == global_invoice_date: # Only update if not already found in section
-                data["Invoice Date"] = match.group(2).strip()
-                # print(f"DEBUG_HEADER: Found Invoice Date in section: {data['Invoice Date']}")
-        elif "Order Date:" in line_stripped and data["Invoice Date"] == global_invoice_date:
-            match = re.search(r"Order Date:\s*(\xa0)?(\d{2}-\d{2}-\d{4})", line_stripped)
-            if match:
-                data["Invoice Date"] = match.group(2).strip()
-                # print(f"DEBUG_HEADER: Found Invoice Date (from Order Date) in section: {data['Invoice Date']}")
+                    data.invoice_number = _INVOICE_NUMBER_SUFFIX_RE.sub("", match.group(1).strip()).strip()
+                    if data.invoice_number:
+                        missing.discard("Invoice Number")
+                        logger.debug("Found %s: %s", name_of_field, data.invoice_number)
+                    break
+
+        # Invoice Date: Capture DD-MM-YYYY; the Order Date stands in for it
+        if "Invoice Date" in missing:
+            if "Invoice Date:" in line_stripped:
+                match = _INVOICE_DATE_RE.search(line_stripped)
+                if match:
+                    data.invoice_date = match.group(1).strip()
+                    missing.discard("Invoice Date")
+            elif "Order Date:" in line_stripped and not has_order_date:
+                match = _ORDER_DATE_RE.search(line_stripped)
+                if match:
+                    data.invoice_date = match.group(1).strip()
+                    has_order_date = True
 
         # Grand Total
-        if "Grand Total ₹" in line_stripped:
-            match = re.search(r"Grand Total\s*₹\s*([-]?[\d,]+\.\d{2})", line_stripped)
-            if match and not data["Total Amount"]:
-                data["Total Amount"] = match.group(1).strip().replace(",", "")
-                # print(f"DEBUG_HEADER: Found Total Amount: {data['Total Amount']}")
+        if "Total Amount" in missing and "Grand Total ₹" in line_stripped:
+            match = _GRAND_TOTAL_RE.search(line_stripped)
+            if match:
+                data.total_amount = parse_amount(match.group(1).strip().replace(",", ""))
+                if data.total_amount is not None:
+                    missing.discard("Total Amount")
+
+        if not missing:
+            logger.debug("Section header complete after %s of %s lines.", line_index + 1, len(stripped_lines))
+            break
+
+def _parse_flipkart_section_index(index, global_order_id="", global_invoice_date=""):
+    """
+    Parses the lines of a single Flipkart invoice or note section, given as a
+    TextIndex (see _section_index()).
+    This helper function contains the core logic for extracting header and item data.
+    It takes global Order ID and Invoice Date as input, which are used as fallbacks.
+
+    Returns:
+        Invoice: The section's data, or None if it has neither an Order ID nor an Invoice Number.
+    """
+    data = Invoice(
+        invoice_type="Unknown",
+        order_id=global_order_id,  # Initialize with global value
+        invoice_date=global_invoice_date, # Initialize with global value
+    )
+
+    # The section's lines are split, stripped and normalized once for all the scans below
+    lines = index.lines
+    stripped_lines = index.stripped_lines
+
+    # --- Extract Header Information for a Single Section ---
+    _scan_section_header(stripped_lines, data)
     
     # --- Extract Items Information for a Single Section ---
     item_section_start_line_index = -1
     item_section_end_line_index = -1
 
     # Find the start of the item list (common headers)
-    for i, line in enumerate(lines):
-        normalized_line = " ".join(line.split()).lower()
+    for i, normalized_line in enumerate(index.iter_normalized_lines()):
         if ("product title" in normalized_line and "qty" in normalized_line and "gross" in normalized_line) or \
            ("description" in normalized_line and "qty" in normalized_line and "gross" in normalized_line):
             item_section_start_line_index = i
@@ -95,16 +492,14 @@ def _parse_single_flipkart_section(section_text, global_order_id="", global_invo
     # Find the end of the item list
     if item_section_start_line_index != -1:
         for i in range(item_section_start_line_index + 1, len(lines)):
-            line = lines[i].strip()
+            line = stripped_lines[i]
             # More specific end markers to avoid including totals as items
-            if re.search(r"Total\s+items:", line, re.IGNORECASE) or \
-               re.search(r"Grand Total\s*₹", line) or \
-               "Signature" in line or \
+            if "Signature" in line or \
                "Authorized Signatory" in line or \
                "Regd. office:" in line or \
                "Contact Flipkart:" in line or \
                "Payment Details" in line or \
-               re.search(r"E\.\s*&\s*O\.E\.\s*page", line): # Stop if next section starts
+               _ITEM_LIST_END_RE.search(line): # Also stops if the next section starts
                 item_section_end_line_index = i
                 # print(f"DEBUG_ITEM: Item section END detected at line {i}: {line}")
                 break
@@ -115,288 +510,15 @@ def _parse_single_flipkart_section(section_text, global_order_id="", global_invo
 
     if item_section_start_line_index != -1 and item_section_end_line_index != -1:
         
-        # Helper function to check if a line is a pure non-item line (header, footer, etc.)
-        def is_pure_non_item_line(line_to_check):
-            # These patterns identify lines that are *definitely* not item data,
-            # focusing on general document structure and column headers that are *not*
-            # part of a numerical item row.
-            patterns_to_check = [
-                r"E\. & O\.E\. page",
-                r"Billing Address",
-                r"Phone: xxxxxxxxxx",
-                r"Order ID:",
-                r"Order Date:",
-                r"Invoice Date:",
-                r"PAN:",
-                r"CIN:",
-                r"Invoice Number",
-                r"Sold By:",
-                r"Ship-from Address:",
-                r"GSTIN",
-                r"Description\s+Qty\s+Gross\s+Amount", # This is the main item table header
-                r"Signature",
-                r"Authorized Signatory",
-                r"Regd\. office:",
-                r"Contact Flipkart:",
-                r"www\.flipkart\.com",
-                r"Total\s+items:", # Summary total line
-                r"Grand Total\s*₹", # Summary total line
-                r"Payment Details",
-                r"Handsets\s*$", # Specific category header line, ends with Handsets
-                # General column headers without values that should be skipped if they appear alone
-                r"^\s*Amount\s*₹Discounts\s*$",
-                r"^\s*/Coupons\s*₹Taxable\s*$",
-                r"^\s*value\s*₹CGST\s*$",
-                r"^\s*₹SGST\s*$",
-                r"^\s*/UTGST\s*$",
-                r"^\s*₹Total\s*₹\s*$",
-                r"^\s*Value\s*₹Total\s*₹\s*$",
-                r"^\s*Value\s*₹IGST\s*$",
-                r"^\s*₹IGST\s*$",
-            ]
-            for pattern in patterns_to_check:
-                if re.search(pattern, line_to_check, re.IGNORECASE):
-                    print(f"DEBUG_ITEM: (is_pure_non_item_line) Matched pattern '{pattern}' for line: '{line_to_check}'")
-                    return True
-            return False
-
-        # Helper function to check if a line is a "Total" summary line
-        def is_total_summary_line(line_to_check):
-            # This regex needs to be precise to only match the overall "Total" sums.
-            # It should not match lines that are part of an item description but contain a total.
-            return bool(re.search(r"^\s*Total\s+\d+\s+([-]?[\d,.-]+)\s+([\d,.-]+)\s+([\d,.-]+)\s+([\d,.-]+)\s+([\d,.-]+)\s+([-]?[\d,]+\.\d{2})$", line_to_check))
-
-
-        # Helper functions for specific item matching patterns
-        def _match_freight_charge(block):
-            match = re.search(
-                r"^(?:SAC:\s*(\d+)\s*)?" # Optional SAC number (Group 1)
-                r"(Freight charges for pick up of(?:\s*\nused product)?)\s*" # Description (Group 2)
-                r"(?:\s*\d+\.\d+(?:0+)?\s*%\s*CGST:\s*)?"
-                r"(?:\s*\n?\s*\d+\.\d+(?:0+)?\s*%\s*SGST/UTGST:\s*)?"
-                r"(\d+)\s*" # Quantity (Group 3)
-                r"([-]?[\d,]+\.\d{2})\s*" # Gross Amount (Group 4)
-                r"([-]?[\d,]+\.\d{2})\s*" # Discounts (Group 5)
-                r"([-]?[\d,]+\.\d{2})\s*" # Taxable (Group 6)
-                r"([-]?[\d,]+\.\d{2})\s*" # CGST (Group 7)
-                r"([-]?[\d,]+\.\d{2})\s*" # SGST (Group 8)
-                r"([-]?[\d,]+\.\d{2})$", # Total (Group 9)
-                block, re.IGNORECASE | re.DOTALL
-            )
-            if match:
-                desc_parts = []
-                if match.group(1): # Add SAC if present
-                    desc_parts.append(f"SAC: {match.group(1).strip()}")
-                desc_parts.append(match.group(2).strip().replace('\n', ' '))
-                desc = " ".join(part for part in desc_parts if part)
-                desc = re.sub(r'\s+', ' ', desc).strip()
-                return {
-                    "Description": desc,
-                    "Quantity": int(match.group(3)),
-                    "Unit Price": float(match.group(4).replace(",", "")),
-                    "Total Item Price": float(match.group(9).replace(",", ""))
-                }, len(match.group(0).splitlines())
-            return None, 0
-
-        def _match_secure_packaging_fee(block):
-            match = re.search(
-                r"^(?:SAC:\s*(\d+)\s*)?" # Optional SAC number (Group 1)
-                r"(Secure Packaging Fee(?:\s*\n?1\.\s*\[IMEI/Serial No:\s*\]\s*([\d\s]+))?)\s*" # Description (Group 2), IMEI (Group 3)
-                r"(?:\s*\d+\.\d+(?:0+)?\s*%\s*CGST:\s*)?"
-                r"(?:\s*\n?\s*\d+\.\d+(?:0+)?\s*%\s*SGST/UTGST:\s*)?"
-                r"(\d+)\s*" # Quantity (Group 4)
-                r"([-]?[\d,]+\.\d{2})\s*" # Gross Amount (Group 5)
-                r"([-]?[\d,]+\.\d{2})\s*" # Discounts (Group 6)
-                r"([-]?[\d,]+\.\d{2})\s*" # Taxable (Group 7)
-                r"([-]?[\d,]+\.\d{2})\s*" # CGST (Group 8)
-                r"([-]?[\d,]+\.\d{2})\s*" # SGST (Group 9)
-                r"([-]?[\d,]+\.\d{2})$", # Total (Group 10)
-                block, re.IGNORECASE | re.DOTALL
-            )
-            if match:
-                desc_parts = []
-                if match.group(1): # SAC number
-                    desc_parts.append(f"SAC: {match.group(1).strip()}")
-                
-                # Combine the base description and IMEI if present
-                base_desc = "Secure Packaging Fee"
-                if match.group(3): # IMEI was captured
-                    base_desc += f" 1. [IMEI/Serial No: ] {match.group(3).strip()}"
-                
-                desc_parts.append(base_desc)
-                
-                desc = " ".join(part for part in desc_parts if part)
-                desc = re.sub(r'\s+', ' ', desc).strip()
-
-                return {
-                    "Description": desc,
-                    "Quantity": int(match.group(4)),
-                    "Unit Price": float(match.group(5).replace(",", "")),
-                    "Total Item Price": float(match.group(10).replace(",", ""))
-                }, len(match.group(0).splitlines())
-            return None, 0
-
-        def _match_product_exchange(block):
-            match = re.search(
-                r"^(Product Exchange)\s*\n" # G1: "Product Exchange" header
-                r"FSN:\s*([A-Z0-9]+)\s*\n" # G2: FSN
-                r"HSN/SAC:\s*(\d+)(?:Exchange of\s*)?" # G3: HSN/SAC, optional "Exchange of"
-                r"([\s\S]+?)(?:\s*\n?Total\s+\d+\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2})?\s*\n" # G4: Product Name (non-greedy), followed by optional internal Total line, and newline
-                r"(\d+)\s+" # G5: Quantity
-                r"([-]?[\d,]+\.\d{2})\s+" # G6: Gross Amount
-                r"([-]?[\d,]+\.\d{2})\s+" # G7: Discounts
-                r"([-]?[\d,]+\.\d{2})\s+" # G8: Taxable Value
-                r"(?:([-]?[\d,]+\.\d{2})\s+)?" # G9: CGST (Optional)
-                r"(?:([-]?[\d,]+\.\d{2})\s+)?" # G10: SGST/UTGST (Optional)
-                r"([-]?[\d,]+\.\d{2})$", # G11: Total Item Price for THIS item
-                block, re.IGNORECASE | re.DOTALL
-            )
-            if match:
-                product_name_raw = match.group(4).strip().replace('\n', ' ')
-                # Remove any numbers or "Total" from the product name if they were accidentally captured
-                product_name_cleaned = re.sub(r'([\d,]+\.\d{2}(?:\s*[-]?[\d,]+\.\d{2})*|Total(?:\s+\d+)?(?:\s*[-]?[\d,]+\.\d{2})*)', '', product_name_raw, flags=re.IGNORECASE).strip()
-                product_name_cleaned = re.sub(r'Sport(?:1)?$', '', product_name_cleaned, flags=re.IGNORECASE).strip() # Remove "Sport" if it's there
-                product_name_cleaned = re.sub(r'\s+', ' ', product_name_cleaned).strip() # Compact spaces
-
-                final_desc_parts = ["Product Exchange"]
-                final_desc_parts.append(f"FSN: {match.group(2).strip()}")
-                final_desc_parts.append(f"HSN/SAC: {match.group(3).strip()}")
-                final_desc_parts.append(product_name_cleaned) # Use the cleaned product name
-                
-                final_desc = " ".join(part for part in final_desc_parts if part).strip()
-                final_desc = re.sub(r'\s+', ' ', final_desc).strip()
-
-                return {
-                    "Description": final_desc,
-                    "Quantity": int(match.group(5)), # Quantity
-                    "Unit Price": float(match.group(6).replace(",", "")), # Gross Amount
-                    "Total Item Price": float(match.group(11).replace(",", "")) # Total Item Price
-                }, len(match.group(0).splitlines())
-            return None, 0
-
-        def _match_spotify_premium(block):
-            match = re.search(
-                r"^(Digital Voucher Code)\s*\n" # G1: "Digital Voucher Code" header
-                r"FSN:\s*([A-Z0-9]+)\s*\n" # G2: FSN
-                r"HSN/SAC:\s*(\d+)(Spotify Premium - \d+M at Rs \d+)\s*\n" # G3: HSN/SAC, G4: Spotify description
-                r"(?:18\.0\s*%\s*IGST:)?\s*" # Optional IGST label
-                r"(\d+)\s+" # G5: Quantity (should be 1)
-                r"([-]?[\d,]+\.\d{2})\s+" # G6: Gross Amount
-                r"([-]?[\d,]+\.\d{2})\s+" # G7: Discounts
-                r"([-]?[\d,]+\.\d{2})\s+" # G8: Taxable Value
-                r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G9: IGST (Optional)
-                r"([-]?[\d,]+\.\d{2})\s*\n" # G10: Total Item Price for THIS item
-                r"(?:Total\s*\d+\s*[-]?[\d,]+\.\d{2}\s*[-]?[\d,]+\.\d{2}\s*[-]?[\d,]+\.\d{2}\s*[-]?[\d,]+\.\d{2})?$", # Optional summary "Total" line for this sub-section
-                block, re.IGNORECASE | re.DOTALL
-            )
-            if match:
-                desc_parts = ["Digital Voucher Code"]
-                if match.group(2): # FSN
-                    desc_parts.append(f"FSN: {match.group(2).strip()}")
-                # Note: HSN/SAC and Spotify description are captured together in G3 and G4,
-                # as '998599Spotify Premium - 12M at Rs 699' is one string.
-                # So we combine them.
-                if match.group(3) and match.group(4):
-                    desc_parts.append(f"HSN/SAC: {match.group(3).strip()} {match.group(4).strip()}")
-                elif match.group(3): # Fallback if G4 is empty
-                     desc_parts.append(f"HSN/SAC: {match.group(3).strip()}")
-                
-                final_desc = " ".join(part for part in desc_parts if part).replace('\n', ' ')
-                final_desc = re.sub(r'\s+', ' ', final_desc).strip()
-
-                return {
-                    "Description": final_desc,
-                    "Quantity": int(match.group(5)),
-                    "Unit Price": float(match.group(6).replace(",", "")),
-                    "Total Item Price": float(match.group(10).replace(",", ""))
-                }, len(match.group(0).splitlines())
-            return None, 0
-        
-        def _match_shipping_and_handling_charges(block):
-            match = re.search(
-                r"^(Shipping And Handling Charges)\s*" # Description (Group 1)
-                r"(\d+)\s*" # Quantity (Group 2)
-                r"([-]?[\d,]+\.\d{2})\s*" # Gross Amount (Group 3)
-                r"([-]?[\d,]+\.\d{2})\s*" # Discounts (Group 4)
-                r"([-]?[\d,]+\.\d{2})\s*" # Taxable (Group 5)
-                r"([-]?[\d,]+\.\d{2})\s*" # CGST (Group 6)
-                r"([-]?[\d,]+\.\d{2})\s*" # SGST (Group 7)
-                r"([-]?[\d,]+\.\d{2})$", # Total (Group 8)
-                block, re.IGNORECASE | re.DOTALL
-            )
-            if match:
-                return {
-                    "Description": match.group(1).strip(),
-                    "Quantity": int(match.group(2)),
-                    "Unit Price": float(match.group(3).replace(",", "")),
-                    "Total Item Price": float(match.group(8).replace(",", ""))
-                }, len(match.group(0).splitlines())
-            return None, 0
-
-
-        def _match_standard_product(block):
-            # This will be the most general pattern, applied last.
-            match = re.search(
-                r"^(?!Total\s+\d+|Grand Total\s*₹|SAC:\s*\d+\s*(?:Freight|Secure)|Product Exchange|Digital Voucher Code|Shipping And Handling Charges)\s*" # Negative lookahead for total/known specific item start lines
-                r"(?:FSN:\s*([A-Z0-9]+)\s*\n)?" # G1: FSN (Optional)
-                r"(?:HSN/SAC:\s*(\d+))?\s*" # G2: HSN/SAC (Optional)
-                # G3: Main product description, multi-line, non-greedy.
-                # Modified negative lookahead to stop before quantity/price or other structured data.
-                r"((?:(?!\s*\n?\s*\d+\s+[-]?[\d,]+\.\d{2}[\s\S]*?$|\s*1\.\s*\[IMEI/Serial No:|\s*Warranty:|\s*Phone and 6 Months Warranty)\s*[\s\S])*?)" 
-                r"(?:\s*\n1\.\s*\[IMEI/Serial No:\s*([\d\s]+)\])?\s*" # G4: IMEI (Optional)
-                r"(?:\s*\nWarranty:.*?)?" # Non-capturing optional warranty
-                r"(?:\s*\nPhone and 6 Months Warranty for In the Box(?:\s*\nAccessories)?)?" # Non-capturing specific warranty lines
-                r"(?:\s*\d+\.\d+(?:0+)?\s*%\s*(?:CGST|SGST/UTGST|IGST):\s*)?" # Non-capturing tax rate lines (label only)
-                r"(\d+)\s*" # G5: Quantity
-                r"([-]?[\d,]+\.\d{2})\s*" # G6: Gross Amount
-                r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G7: Discounts (Optional)
-                r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G8: Taxable Value (Optional)
-                r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G9: CGST (Optional)
-                r"(?:([-]?[\d,]+\.\d{2})\s*)?" # G10: SGST/UTGST (Optional)
-                r"([-]?[\d,]+\.\d{2})$", # G11: Total
-                block, re.IGNORECASE | re.DOTALL
-            )
-            if match:
-                full_description_parts = []
-                if match.group(1): # FSN
-                    full_description_parts.append(f"FSN: {match.group(1).strip()}")
-                if match.group(2): # HSN/SAC
-                    full_description_parts.append(f"HSN/SAC: {match.group(2).strip()}")
-                
-                item_desc_core = match.group(3).strip()
-                # Aggressive cleanup for the description
-                item_desc_core = re.sub(r'1\.\s*\[IMEI/Serial No:\s*[\d\s]+\]', '', item_desc_core, flags=re.IGNORECASE | re.DOTALL).strip()
-                item_desc_core = re.sub(r'Warranty:.*$', '', item_desc_core, flags=re.IGNORECASE | re.DOTALL).strip()
-                item_desc_core = re.sub(r'Phone and 6 Months Warranty for In the Box(?:Accessories)?', '', item_desc_core, flags=re.IGNORECASE | re.DOTALL).strip()
-                item_desc_core = re.sub(r'\s*\d+\.\d+(?:0+)?\s*%\s*(?:CGST:|SGST/UTGST:|IGST:)?', '', item_desc_core, flags=re.IGNORECASE).strip()
-                item_desc_core = re.sub(r'Amount ₹Discounts|/Coupons ₹Taxable|value ₹CGST|₹SGST|/UTGST|₹Total ₹|Value ₹IGST|Value ₹Total ₹|Handsets|Accessories', '', item_desc_core, flags=re.IGNORECASE).strip()
-                item_desc_core = re.sub(r'(?:FSN:\s*[A-Z0-9]+|HSN/SAC:\s*\d+)\s*', '', item_desc_core, flags=re.IGNORECASE).strip() # Remove FSN/HSN from description if they leaked
-                item_desc_core = re.sub(r'([\d,]+\.\d{2}(?:\s*[-]?[\d,]+\.\d{2})*|\s*Total(?:\s*\d+)?(?:\s*[-]?[\d,]+\.\d{2})*)', '', item_desc_core, flags=re.IGNORECASE).strip() # Remove numerical values/totals that might have snuck in
-                item_desc_core = re.sub(r'\b\d{10,}\b', '', item_desc_core, flags=re.IGNORECASE).strip() # Remove long numbers that might be IMEI if not captured by G4
-                item_desc_core = re.sub(r'\s+', ' ', item_desc_core).strip() # Compact multiple spaces
-
-
-                full_description_parts.append(item_desc_core)
-
-                if match.group(4): # IMEI
-                    full_description_parts.append(f"[IMEI/Serial No: {match.group(4).strip()}]")
-                
-                final_desc = " ".join(part for part in full_description_parts if part).replace('\n', ' ')
-                final_desc = re.sub(r'\s+', ' ', final_desc).strip() # Compact multiple spaces
-
-                return {
-                    "Description": final_desc,
-                    "Quantity": int(match.group(5)),
-                    "Unit Price": float(match.group(6).replace(",", "")),
-                    "Total Item Price": float(match.group(11).replace(",", ""))
-                }, len(match.group(0).splitlines())
-            return None, 0
+        # Classify every item-section line once; the loop and its lookahead reuse the labels
+        line_labels = {i: _classify_item_line(stripped_lines[i])
+                       for i in range(item_section_start_line_index + 1, item_section_end_line_index)}
 
         # Iterate through lines within the identified item section
         line_idx = item_section_start_line_index + 1
         while line_idx < item_section_end_line_index:
-            line = lines[line_idx].strip()
-            print(f"DEBUG_ITEM: Processing line {line_idx}: '{line}'")
+            line = stripped_lines[line_idx]
+            logger.debug("Processing line %s: '%s'", line_idx, line)
 
             processed_lines_for_item = 1 # Initialize for each iteration
 
@@ -405,14 +527,14 @@ def _parse_single_flipkart_section(section_text, global_order_id="", global_invo
                 continue
             
             # --- Aggressive skipping of lines that are absolutely NOT items ---
-            if is_pure_non_item_line(line):
-                print(f"DEBUG_ITEM: Skipping known non-item/summary/address line: '{line}'")
+            if line_labels[line_idx] == LINE_NON_ITEM:
+                logger.debug("Skipping known non-item/summary/address line: '%s'", line)
                 line_idx += 1
                 continue
 
             # --- Explicitly skip "Total" summary lines to prevent them from becoming items ---
-            if is_total_summary_line(line):
-                print(f"DEBUG_ITEM: Found a 'Total' summary line, explicitly skipping: '{line}'")
+            if line_labels[line_idx] == LINE_TOTAL_SUMMARY:
+                logger.debug("Found a 'Total' summary line, explicitly skipping: '%s'", line)
                 line_idx += 1
                 continue
             
@@ -422,155 +544,308 @@ def _parse_single_flipkart_section(section_text, global_order_id="", global_invo
             # Try to grab up to next 10 lines for matching, or until end of section
             for k in range(10): 
                 if (current_temp_line_idx + k) < item_section_end_line_index:
-                    current_line_to_add = lines[current_temp_line_idx + k].strip()
-                    if is_pure_non_item_line(current_line_to_add) or is_total_summary_line(current_line_to_add):
-                        print(f"DEBUG_ITEM: Breaking lookahead as line {current_temp_line_idx + k} ('{current_line_to_add}') is a pure non-item/summary line.")
+                    current_line_to_add = stripped_lines[current_temp_line_idx + k]
+                    current_label = line_labels[current_temp_line_idx + k]
+                    if current_label in (LINE_NON_ITEM, LINE_TOTAL_SUMMARY):
+                        logger.debug("Breaking lookahead as line %s ('%s') is a pure non-item/summary line.", current_temp_line_idx + k, current_line_to_add)
                         break
                     # Also break if the line seems to start a new item's data section
-                    if re.match(r"^(?:FSN:|HSN/SAC:|SAC:\s*\d+|Shipping And Handling Charges|Product Exchange|Digital Voucher Code)\b", current_line_to_add, re.IGNORECASE) and k > 0:
-                         print(f"DEBUG_ITEM: Breaking lookahead as line {current_temp_line_idx + k} ('{current_line_to_add}') appears to be start of new item (specific type).")
+                    if current_label == LINE_ITEM_START and k > 0:
+                         logger.debug("Breaking lookahead as line %s ('%s') appears to be start of new item (specific type).", current_temp_line_idx + k, current_line_to_add)
                          break
-                    if re.match(r"^\d+\s+[-]?[\d,]+\.\d{2}\s+[-]?[\d,]+\.\d{2}", current_line_to_add) and k > 0: # Checks for Qty Amount Discount pattern
-                        print(f"DEBUG_ITEM: Breaking lookahead as line {current_temp_line_idx + k} ('{current_line_to_add}') appears to be numerical start of new item.")
+                    if current_label == LINE_NUMERIC_START and k > 0: # Checks for Qty Amount Discount pattern
+                        logger.debug("Breaking lookahead as line %s ('%s') appears to be numerical start of new item.", current_temp_line_idx + k, current_line_to_add)
                         break # Changed from pass to break
                     lookahead_lines.append(current_line_to_add)
                 else:
                     break
             
             potential_full_item_block = "\n".join(lookahead_lines)
-            print(f"DEBUG_ITEM: Attempting to match with full block (from line {line_idx}): '{potential_full_item_block}'")
+            logger.debug("Attempting to match with full block (from line %s): '%s'", line_idx, potential_full_item_block)
 
-            found_item = None
-            consumed_lines = 0
-
-            # Order of matching is crucial: most specific to most general
-            # Attempt more specific matches first
-            found_item, consumed_lines = _match_freight_charge(potential_full_item_block)
-            if found_item:
-                data["Items"].append(found_item)
-                print(f"DEBUG_ITEM: Added Freight Charge item: {found_item}")
-                line_idx += consumed_lines
-                continue
-
-            found_item, consumed_lines = _match_secure_packaging_fee(potential_full_item_block)
-            if found_item:
-                data["Items"].append(found_item)
-                print(f"DEBUG_ITEM: Added Secure Packaging Fee item: {found_item}")
-                line_idx += consumed_lines
-                continue
-
-            found_item, consumed_lines = _match_spotify_premium(potential_full_item_block)
-            if found_item:
-                data["Items"].append(found_item)
-                print(f"DEBUG_ITEM: Added Spotify Premium item: {found_item}")
-                line_idx += consumed_lines
-                continue
-            
-            found_item, consumed_lines = _match_shipping_and_handling_charges(potential_full_item_block)
-            if found_item:
-                data["Items"].append(found_item)
-                print(f"DEBUG_ITEM: Added Shipping And Handling Charges item: {found_item}")
-                line_idx += consumed_lines
-                continue
-
-            found_item, consumed_lines = _match_product_exchange(potential_full_item_block)
-            if found_item:
-                data["Items"].append(found_item)
-                print(f"DEBUG_ITEM: Added Product Exchange item: {found_item}")
-                line_idx += consumed_lines
+            try:
+                found_item, consumed_lines, rule_name = _match_item_block(potential_full_item_block)
+            except RegexTimeout:
+                # A runaway match must not hang the worker: leave this block unparsed and move on
+                logger.warning("Item block starting at line %s exceeded the regex time budget; leaving it unparsed.", line_idx)
+                line_idx += 1
                 continue
-
-            # Fallback to standard product last
-            found_item, consumed_lines = _match_standard_product(potential_full_item_block)
             if found_item:
-                data["Items"].append(found_item)
-                print(f"DEBUG_ITEM: Added Standard Product item: {found_item}")
+                data.items.append(found_item)
+                logger.debug("Added %s item: %s", rule_name, found_item)
                 line_idx += consumed_lines
                 continue
 
             # If no specific item pattern matched by any of the helper functions
-            print(f"DEBUG_ITEM: Line '{line}' (from line_idx {line_idx}) was not matched by any item pattern. Advancing by 1.")
+            logger.debug("Line '%s' (from line_idx %s) was not matched by any item pattern. Advancing by 1.", line, line_idx)
             line_idx += 1 # Default: advance by 1 (consume current line and try next)
 
     # Return only if primary identifiers (Order ID or Invoice Number) are found
-    if data["Order ID"] or data["Invoice Number"]:
+    if data.order_id or data.invoice_number:
         return data
-    return {}
+    return None
 
 
-def parse_flipkart_invoice(full_text):
-    """
-    Parses the full text from a Flipkart PDF, identifying and processing
-    multiple invoice/note sections within the document.
-    Also attempts to capture global Order ID and Invoice Date that might appear
-    at the very beginning of the full document.
+# The global Order ID / Invoice Date fallback is only looked for this far into the document
+_GLOBAL_FIELDS_SCAN_CHARS = 500
 
-    Args:
-        full_text (str): The entire raw text extracted from the PDF.
+# Marks the end of each invoice/note section ("E. & O.E. page 1 of 1")
+_SECTION_DELIMITER_RE = compile_pattern(r"(E\.\s*&\s*O\.E\.\s*page\s*\d+\s*of\s*\d+)", re.IGNORECASE | re.DOTALL)
+_NON_SPACE_RE = compile_pattern(r"\S") # \S is exactly what str.strip() keeps
+
+def _find_global_fields(full_text):
+    """
+    Looks for the Order ID and Invoice Date at the very beginning of the
+    document, used as fallbacks for sections that do not state their own.
 
     Returns:
-        list: A list of dictionaries, where each dictionary represents a
-              parsed invoice or note section.
+        tuple: (global_order_id, global_invoice_date), "" where not found.
     """
-    all_parsed_sections = []
-    
-    # Attempt to capture global Order ID and Invoice Date from the very beginning of the text
     global_order_id = ""
     global_invoice_date = ""
+    head_text = full_text[:_GLOBAL_FIELDS_SCAN_CHARS]
 
     # Search for Order ID in the first few lines of the full text
-    order_id_match = re.search(r"Order ID:\s*(\xa0)?([A-Z0-9]+)", full_text[:500]) # Search in first 500 chars
+    order_id_match = _ORDER_ID_RE.search(head_text)
     if order_id_match:
-        global_order_id = order_id_match.group(2).strip()
-        print(f"DEBUG_GLOBAL: Found Global Order ID: {global_order_id}")
+        global_order_id = order_id_match.group(1).strip()
+        logger.debug("Found Global Order ID: %s", global_order_id)
 
     # Search for Invoice Date in the first few lines of the full text (Order Date often doubles as Invoice Date)
-    invoice_date_match = re.search(r"(?:Invoice Date:|Order Date:)\s*(\xa0)?(\d{2}-\d{2}-\d{4})", full_text[:500])
+    invoice_date_match = _GLOBAL_INVOICE_DATE_RE.search(head_text)
     if invoice_date_match:
-        global_invoice_date = invoice_date_match.group(2).strip()
-        print(f"DEBUG_GLOBAL: Found Global Invoice Date: {global_invoice_date}")
+        global_invoice_date = invoice_date_match.group(1).strip()
+        logger.debug("Found Global Invoice Date: %s", global_invoice_date)
 
+    return global_order_id, global_invoice_date
 
-    # Split the document into potential sections based on the "E. & O.E. page" marker
-    section_delimiter_pattern = r"(?s)(E\.\s*&\s*O\.E\.\s*page\s*\d+\s*of\s*\d+)"
-    raw_parts = re.split(section_delimiter_pattern, full_text, flags=re.IGNORECASE)
+# Characters a section delimiter can consist of besides whitespace and digits
+# (matched case-insensitively)
+_SECTION_DELIMITER_CHARS = frozenset("EeOoPpAaGgFf.&")
 
-    sections_to_process = []
-    current_section_content = []
-    current_section_marker = ""
+def _open_delimiter_start(text, floor):
+    """
+    Returns the offset (at least floor) from which text may still hold the
+    start of a section delimiter that more text could complete or extend.
 
-    # Process the raw parts: ['preamble', 'delimiter1', 'content1', 'delimiter2', 'content2', ...]
-    for i, part in enumerate(raw_parts):
-        if not part.strip():
-            continue
-        
-        # If the part is a delimiter (e.g., "E. & O.E. page 1 of 1"), and we have accumulated content,
-        # then finalize the previous section and start a new one.
-        if re.match(section_delimiter_pattern, part, re.IGNORECASE):
-            if current_section_content:
-                sections_to_process.append(current_section_marker + "\n" + "\n".join(current_section_content))
-            current_section_marker = part.strip()
-            current_section_content = []
-        else:
-            current_section_content.append(part.strip())
+    A delimiter consists only of whitespace, digits and the characters in
+    _SECTION_DELIMITER_CHARS and starts with an "E", so only the trailing run
+    of such characters, from its first "E" on, has to be scanned again once
+    the next chunk arrives. Everything before it is final.
+    """
+    position = len(text)
+    while position > floor:
+        char = text[position - 1]
+        if not (char in _SECTION_DELIMITER_CHARS or char.isspace() or char.isdecimal()):
+            break
+        position -= 1
+    starts = [start for start in (text.find("E", position), text.find("e", position)) if start != -1]
+    return min(starts) if starts else len(text)
 
-    # After the loop, add the last collected section if any content remains
-    if current_section_content:
-        sections_to_process.append(current_section_marker + "\n" + "\n".join(current_section_content))
+def _strip_bounds(text, start, end):
+    """
+    Returns the bounds of text[start:end].strip() as (start, end), without
+    the copy, or None if that part of text is whitespace only.
+    """
+    content_match = _NON_SPACE_RE.search(text, start, end)
+    if not content_match:
+        return None
+    start = content_match.start()
+    while text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def _iter_flipkart_sections(text_chunks):
+    """
+    Splits a document arriving in chunks (e.g. one per page) into its
+    invoice/note sections on the "E. & O.E. page N of M" marker, yielding
+    each section as soon as the marker after it has been read. Each section
+    is the marker that preceded it (none for the first) plus the text up to
+    the next marker, with surrounding whitespace removed; whitespace-only
+    sections are dropped.
+
+    The work is linear in the length of the document: after each chunk the
+    scan resumes where the text could still form a marker, instead of at the
+    start of the current section, and the text of a section spanning chunks
+    is kept as a list of pieces that is joined once, when the section ends.
+    Sections within one chunk are not copied, so for a single chunk every
+    section is an offset range into that chunk itself.
 
-    # Now, parse each identified section, passing global order ID and date
-    for section_text in sections_to_process:
-        parsed_data = _parse_single_flipkart_section(section_text, global_order_id, global_invoice_date)
+    Args:
+        text_chunks (iterable): The document text in order, e.g. each page
+                                followed by its newline separator.
+
+    Yields:
+        tuple: (text, marker, start, end) per section, in document order;
+               the section content is text[start:end].
+    """
+    chunks = iter(text_chunks)
+    section_marker = ""
+    section_parts = [] # Text of the current section from earlier chunks
+    scan_text = next(chunks, None)
+    while scan_text is not None:
+        # One chunk of lookahead: a marker touching the end of scan_text could
+        # still be extended by the next chunk (e.g. "page 1 of 1" + "2"), so it
+        # is only trusted once no more text follows.
+        next_chunk = next(chunks, None)
+        finished = next_chunk is None
+
+        section_start = 0
+        while True:
+            match = _SECTION_DELIMITER_RE.search(scan_text, section_start)
+            if not finished and (not match or match.end() == len(scan_text)):
+                break
+            end = match.start() if match else len(scan_text)
+            if section_parts:
+                section_parts.append(scan_text[section_start:end])
+                section_text = "".join(section_parts)
+                section_parts = []
+                bounds = _strip_bounds(section_text, 0, len(section_text))
+            else:
+                section_text = scan_text
+                bounds = _strip_bounds(scan_text, section_start, end)
+            if bounds:
+                yield (section_text, section_marker) + bounds
+            if not match:
+                return
+            section_marker = match.group(1).strip()
+            section_start = match.end()
+
+        # Keep what is final and carry only the possible start of a marker over
+        resume = _open_delimiter_start(scan_text, section_start)
+        section_parts.append(scan_text[section_start:resume])
+        scan_text = scan_text[resume:] + next_chunk
+
+def _find_flipkart_sections(full_text):
+    """
+    Finds the sections of the whole document in a single pass, as offsets
+    into full_text instead of copied section texts; see _iter_flipkart_sections().
+
+    Returns:
+        list: (marker, start, end) per section, in document order; the
+              section content is full_text[start:end].
+    """
+    # With a single chunk, every section's text is full_text itself
+    return [(section_marker, start, end)
+            for _, section_marker, start, end in _iter_flipkart_sections((full_text,))]
+
+def _section_index(section_text, section_marker, start, end):
+    # A section's lines start with the marker line(s) that preceded it (an empty line for the first section)
+    return TextIndex.from_range(section_text, start, end, section_marker.splitlines() or [""])
+
+def iter_flipkart_invoice_sections(text_chunks):
+    """
+    Streaming counterpart of parse_flipkart_invoice(). Consumes the text of a
+    document in chunks (e.g. each page followed by its newline, as they are
+    decoded) and yields each parsed section as soon as the marker that ends
+    it has been read, so parsing overlaps with text extraction and memory is
+    bounded by the largest section instead of the whole document. Yields the
+    same sections as parse_flipkart_invoice() on the joined text.
+
+    The global Order ID / Invoice Date fallback comes from the first 500
+    characters of the document, so sections are held back until that much
+    text has been read.
+
+    Args:
+        text_chunks (iterable): The document text in order.
+
+    Yields:
+        Invoice: Each parsed invoice or note section.
+    """
+    head_parts = []
+    head_length = 0
+
+    def read_chunks():
+        nonlocal head_length
+        for chunk in text_chunks:
+            if head_length < _GLOBAL_FIELDS_SCAN_CHARS:
+                head_parts.append(chunk[:_GLOBAL_FIELDS_SCAN_CHARS - head_length])
+                head_length += len(head_parts[-1])
+            yield chunk
+
+    global_fields = None
+    pending_sections = []
+    for section in _iter_flipkart_sections(read_chunks()):
+        pending_sections.append(_section_index(*section))
+        if global_fields is None:
+            if head_length < _GLOBAL_FIELDS_SCAN_CHARS:
+                continue
+            global_fields = _find_global_fields("".join(head_parts))
+        for section_index in pending_sections:
+            parsed_data = _parse_flipkart_section_index(section_index, *global_fields)
+            if parsed_data:
+                yield parsed_data
+        pending_sections = []
+
+    if global_fields is None:
+        global_fields = _find_global_fields("".join(head_parts))
+    for section_index in pending_sections:
+        parsed_data = _parse_flipkart_section_index(section_index, *global_fields)
         if parsed_data:
-            all_parsed_sections.append(parsed_data)
+            yield parsed_data
+
+def parse_flipkart_invoice(full_text, section_workers=1):
+    """
+    Parses the full text from a Flipkart PDF, identifying and processing
+    multiple invoice/note sections within the document.
+    Also attempts to capture global Order ID and Invoice Date that might appear
+    at the very beginning of the full document.
+
+    Args:
+        full_text (str): The entire raw text extracted from the PDF.
+        section_workers (int): Number of processes used to parse the sections
+                               concurrently. Sections are independent, so this
+                               pays off on consolidated PDFs with hundreds of
+                               them. Results keep the document order.
+
+    Returns:
+        list: A list of Invoice objects, one per parsed invoice or note
+              section. Invoice.to_dict() gives the old dictionary form.
+    """
+    # Attempt to capture global Order ID and Invoice Date from the very beginning of the text
+    global_order_id, global_invoice_date = _find_global_fields(full_text)
 
-    return all_parsed_sections
+    # Sections are offsets into full_text. Each one's lines are only split out
+    # when it is parsed.
+    sections_to_process = _find_flipkart_sections(full_text)
 
+    def iter_section_indexes():
+        for section_marker, start, end in sections_to_process:
+            yield _section_index(full_text, section_marker, start, end)
+
+    # Now, parse each identified section, passing global order ID and date
+    if section_workers > 1 and len(sections_to_process) > 1:
+        max_workers = min(section_workers, len(sections_to_process))
+        logger.debug("Parsing %s sections with %s processes.", len(sections_to_process), max_workers)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_logging,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+            parsed_sections = list(executor.map(
+                _parse_flipkart_section_index,
+                iter_section_indexes(),
+                itertools.repeat(global_order_id),
+                itertools.repeat(global_invoice_date),
+                chunksize=max(1, len(sections_to_process) // (max_workers * 4)),
+            ))
+    else:
+        parsed_sections = [_parse_flipkart_section_index(section_index, global_order_id, global_invoice_date)
+                           for section_index in iter_section_indexes()]
+
+    return [parsed_data for parsed_data in parsed_sections if parsed_data]
+
+
+# Text that identifies a Flipkart document for vendor detection (matched case-insensitively)
+VENDOR_FINGERPRINTS = ("flipkart.com", "flipkart internet")
+# Flipkart documents can mention Amazon as well (e.g. in a product title), so
+# Flipkart wins whenever one of its fingerprints occurs
+register_vendor("Flipkart", VENDOR_FINGERPRINTS, parse_flipkart_invoice, iter_flipkart_invoice_sections,
+                priority=1, version=PARSER_VERSION)
 
 # This block allows you to test the extract_flipkart.py script independently.
 if __name__ == "__main__":
     import os
     import sys
+
+    configure_logging(logging.DEBUG)
     
     script_dir = os.path.dirname(__file__)
     project_root = os.path.abspath(os.path.join(script_dir, '..'))
@@ -606,7 +881,7 @@ if __name__ == "__main__":
             if all_parsed_flipkart_data:
                 for idx, invoice_data in enumerate(all_parsed_flipkart_data):
                     print(f"\n----- Section {idx + 1} -----")
-                    for key, value in invoice_data.items():
+                    for key, value in invoice_data.to_dict().items():
                         if key == "Items":
                             print(f"{key}:")
                             for item in value:
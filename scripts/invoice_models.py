@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass(slots=True)
+class LineItem:
+    """
+    One line item of an invoice, with its numbers already converted.
+
+    Slots keep a line item to a few dozen bytes plus its values, instead of a
+    dict per item keyed by column names.
+    """
+    description: str = ""
+    quantity: int = 0
+    unit_price: float = 0.0
+    total_item_price: float = 0.0
+
+    def to_dict(self):
+        """
+        Returns the item in the dict form the parsers used to produce.
+        """
+        return {
+            "Description": self.description,
+            "Quantity": self.quantity,
+            "Unit Price": self.unit_price,
+            "Total Item Price": self.total_item_price,
+        }
+
+@dataclass(slots=True)
+class Invoice:
+    """
+    One parsed invoice (or Flipkart debit/credit note) and its line items.
+
+    total_amount is None when the document states no total.
+    """
+    invoice_type: str = ""
+    invoice_number: str = ""
+    order_id: str = ""
+    invoice_date: str = ""
+    total_amount: Optional[float] = None
+    items: List[LineItem] = field(default_factory=list)
+
+    def to_dict(self):
+        """
+        Returns the invoice in the dict form the parsers used to produce, for
+        callers that index it by column name. "Total Amount" is the number,
+        or "" when there is none.
+        """
+        return {
+            "Invoice Type": self.invoice_type,
+            "Invoice Number": self.invoice_number,
+            "Order ID": self.order_id,
+            "Invoice Date": self.invoice_date,
+            "Total Amount": "" if self.total_amount is None else self.total_amount,
+            "Items": [item.to_dict() for item in self.items],
+        }
+
+def parse_amount(amount_text):
+    """
+    Converts an amount as extracted from the text (thousands separators
+    already removed) to a float.
+
+    Returns:
+        float: The amount, or None if amount_text is empty or not a number.
+    """
+    try:
+        return float(amount_text)
+    except (TypeError, ValueError):
+        return None
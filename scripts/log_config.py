@@ -0,0 +1,14 @@
+import logging
+
+LOG_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+def configure_logging(log_level):
+    """
+    Sets up logging for the current process. Also used as the initializer of
+    every worker pool (PDFs, Flipkart sections, Amazon invoices), because
+    spawned worker processes start without any logging configuration.
+
+    Args:
+        log_level (int or str): E.g. logging.INFO or "DEBUG".
+    """
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
@@ -1,11 +1,18 @@
 import os
 import sys
+import time
+import logging
+import itertools
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 # Add the scripts directory to the Python path
 script_dir = os.path.dirname(__file__)
 project_root = os.path.abspath(os.path.join(script_dir, '..'))
 input_folder = os.path.join(project_root, 'input_pdfs')
 output_folder = os.path.join(project_root, 'output_excel')
+cache_folder = os.path.join(project_root, '.text_cache')
 
 if project_root not in sys.path:
     sys.path.append(project_root)
@@ -13,15 +20,380 @@ if script_dir not in sys.path:
     sys.path.append(script_dir)
 
 try:
-    from pdf_reader import extract_text_from_pdf
-    from extract_flipkart import parse_flipkart_invoice
-    from extract_amazon import parse_amazon_invoice # Import the Amazon parser
-    from excel_writer import write_to_excel
+    from pdf_reader import iter_cached_page_texts, iter_page_chunks, join_page_texts, PdfTextError
+    # Importing the parsers registers their vendors with default_detector
+    import extract_flipkart
+    import extract_amazon
+    from vendor_detector import default_detector, DEFAULT_TRIAGE_PAGES
+    from pdf_classifier import classify_main
+    from excel_writer import write_to_excel, WRITER_VERSION
+    from text_cache import TextCache, DEFAULT_CACHE_MAX_BYTES
+    from run_manifest import RunManifest, MANIFEST_FILENAME, fingerprint_bytes
+    from log_config import configure_logging
 except ImportError as e:
     print(f"Error: Could not import necessary modules. Please ensure all scripts are in the 'scripts' directory and openpyxl is installed. Error: {e}")
     sys.exit(1)
 
-def main():
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+logger = logging.getLogger(__name__)
+
+# Recorded in the run manifest; a change in the set of vendors, any parser or
+# the Excel writer invalidates earlier results.
+PIPELINE_VERSION = f"{default_detector.version_key()}/writer-{WRITER_VERSION}"
+
+# Concurrent file reads in --pipeline mode
+PIPELINE_READ_THREADS = 4
+DEFAULT_QUEUE_SIZE = 16
+
+def _new_result(pdf_path):
+    return {"file": os.path.basename(pdf_path), "status": "failed", "output": None, "fingerprint": None}
+
+def read_pdf(pdf_path):
+    """
+    Reads a PDF into memory and fingerprints it for the run manifest.
+
+    Returns:
+        tuple: (pdf_bytes, fingerprint)
+    """
+    stat = os.stat(pdf_path)
+    with open(pdf_path, 'rb') as file:
+        pdf_bytes = file.read()
+    return pdf_bytes, fingerprint_bytes(pdf_bytes, stat)
+
+def parse_pdf(pdf_path, pdf_bytes, cache=None, section_workers=1, triage_pages=DEFAULT_TRIAGE_PAGES,
+              pdf_sha256=None):
+    """
+    Extracts the text of an already-read PDF, detects the vendor and parses
+    the invoice data. Nothing is written to disk.
+
+    Only the first triage_pages pages are decoded before vendor detection;
+    the remaining pages are decoded only if a registered vendor is found, so
+    a PDF from an unknown sender costs a page or two instead of all of them.
+    If the vendor has a streaming parser and section_workers is 1, the
+    remaining pages are parsed as they are decoded instead of being joined
+    into one text first.
+
+    This is a module-level function so it can be submitted to a
+    ProcessPoolExecutor. Every error is caught here.
+
+    Args:
+        pdf_path (str): The full path to the PDF file (used for messages and the cache).
+        pdf_bytes (bytes): The PDF content, as returned by read_pdf().
+        cache (TextCache, optional): Extracted-text cache consulted before PyPDF2 decodes the file.
+        section_workers (int): Processes used to parse the sections (Flipkart) or invoices (Amazon) of one PDF.
+        triage_pages (int): Pages the vendor is detected from. 0 or None detects from the whole document.
+        pdf_sha256 (str, optional): Hex SHA-256 of pdf_bytes from read_pdf()'s
+                                    fingerprint, so the text cache does not hash the file again.
+
+    Returns:
+        dict: A summary as described in process_pdf(). If parsing produced
+              data, "status" is "parsed" and the summary also holds
+              "invoice_type" and "parsed_data" for write_parsed_invoices().
+    """
+    pdf_file = os.path.basename(pdf_path)
+    result = _new_result(pdf_path)
+    print(f"\n--- Processing PDF: '{pdf_file}' ---")
+
+    try:
+        print("Attempting to extract text from PDF...")
+        page_texts = iter_cached_page_texts(pdf_path, cache=cache, pdf_bytes=pdf_bytes, pdf_sha256=pdf_sha256)
+        try:
+            raw_text = join_page_texts(page_texts, pdf_path, max_pages=triage_pages or None)
+            if not raw_text:
+                print(f"Warning: No text extracted from '{pdf_file}'. Skipping.")
+                result["status"] = "no_text"
+                return result
+
+            # One lowercase pass over the text finds the fingerprints of every registered vendor
+            vendor_match = default_detector.detect(raw_text)
+            if vendor_match is None:
+                print(f"Could not determine invoice type for '{pdf_file}'. Skipping.")
+                result["status"] = "unknown_vendor"
+                return result
+
+            invoice_type = vendor_match.vendor
+            logger.debug("Vendor %s detected with confidence %.2f (matched %s).",
+                         invoice_type, vendor_match.confidence, ", ".join(vendor_match.matched_fingerprints))
+
+            if vendor_match.stream_parser is not None and section_workers <= 1:
+                # Parse each section as soon as the pages holding it are decoded
+                print(f"Detected {invoice_type} invoice: '{pdf_file}'. Parsing while the text is extracted...")
+                text_chunks = itertools.chain((raw_text,), iter_page_chunks(page_texts, pdf_path))
+                parsed_data = list(vendor_match.stream_parser(text_chunks))
+                print("Text extraction complete.")
+            else:
+                # Decode the pages the triage did not read
+                remaining_text = join_page_texts(page_texts, pdf_path)
+                if remaining_text is None:
+                    print(f"Warning: No text extracted from '{pdf_file}'. Skipping.")
+                    result["status"] = "no_text"
+                    return result
+                raw_text += remaining_text
+                print("Text extraction complete. Proceeding to parse invoice data.")
+                print(f"Detected {invoice_type} invoice: '{pdf_file}'. Attempting to parse...")
+                # Parsers return a list of invoices (sections, or the invoices of a bulk download)
+                parsed_data = vendor_match.parser(raw_text, section_workers)
+        except PdfTextError:
+            # A page failed to decode while the sections were being parsed
+            print(f"Warning: No text extracted from '{pdf_file}'. Skipping.")
+            result["status"] = "no_text"
+            return result
+        finally:
+            page_texts.close() # Releases the file if triage stopped early
+
+        if parsed_data:
+            result["status"] = "parsed"
+            result["invoice_type"] = invoice_type
+            result["parsed_data"] = parsed_data
+        else:
+            print(f"Warning: No data parsed from {invoice_type} invoice: '{pdf_file}'.")
+            result["status"] = "no_data"
+
+    except Exception as e:
+        print(f"Error processing '{pdf_file}': {e}")
+        import traceback
+        traceback.print_exc() 
+
+    return result
+
+def write_parsed_invoices(result, output_folder, write_only=False):
+    """
+    Writes the data of a "parsed" summary from parse_pdf() to its Excel file
+    and updates the summary in place: "parsed_data" is dropped and "status"
+    becomes "written" (or "failed" if writing failed). write_only is passed
+    on to write_to_excel().
+
+    Returns:
+        dict: The updated summary.
+    """
+    pdf_file = result["file"]
+    invoice_type = result.pop("invoice_type")
+    parsed_data = result.pop("parsed_data")
+    result["status"] = "failed"
+
+    base_filename = os.path.splitext(pdf_file)[0] 
+    # Create a shorter sheet name by using the base filename and invoice type, truncate if necessary
+    # Max 20 chars of filename + type, total 31 chars
+    sheet_name_for_excel = f"{base_filename[:min(20, len(base_filename))]}_{invoice_type}" 
+    
+    output_excel_filename = f"{base_filename}_{invoice_type}_invoice.xlsx"
+    output_filepath = os.path.join(output_folder, output_excel_filename)
+
+    try:
+        print(f"Attempting to write parsed data to: {output_filepath}")
+        write_to_excel(parsed_data, output_filepath, sheet_name_for_excel, write_only=write_only) # Use the shorter sheet name
+        print(f"Successfully wrote data from '{pdf_file}' to '{output_filepath}'")
+        result["status"] = "written"
+        result["output"] = output_filepath
+    except Exception as e:
+        print(f"Error writing parsed data to Excel for '{pdf_file}': {e}")
+        import traceback
+        traceback.print_exc()
+    return result
+
+def process_pdf(pdf_path, output_folder, cache=None, write_only=False, section_workers=1,
+                triage_pages=DEFAULT_TRIAGE_PAGES):
+    """
+    Runs the full pipeline (reading, text extraction, vendor detection,
+    parsing and Excel writing) for a single PDF.
+
+    This is a module-level function so it can be submitted to a
+    ProcessPoolExecutor. Every error is caught here, so one bad PDF never
+    takes down the rest of a batch.
+
+    Args:
+        pdf_path (str): The full path to the PDF file.
+        output_folder (str): The folder the Excel file is written to.
+        cache (TextCache, optional): Extracted-text cache consulted before PyPDF2 decodes the file.
+        write_only (bool): Write the Excel file in openpyxl's streaming write-only mode.
+        section_workers (int): Processes used to parse the sections (Flipkart) or invoices (Amazon) of one PDF.
+        triage_pages (int): Pages decoded for vendor detection; see parse_pdf().
+
+    Returns:
+        dict: A summary of the outcome, e.g.
+              {"file": "243.pdf", "status": "written", "output": "...", "fingerprint": {...}}.
+              "status" is one of "written", "no_text", "unknown_vendor",
+              "no_data" or "failed". "fingerprint" is the input's size, mtime
+              and SHA-256 as seen before processing, for the run manifest.
+    """
+    try:
+        pdf_bytes, fingerprint = read_pdf(pdf_path)
+    except OSError as e:
+        print(f"Error reading '{pdf_path}': {e}")
+        return _new_result(pdf_path)
+
+    result = parse_pdf(pdf_path, pdf_bytes, cache, section_workers, triage_pages, fingerprint["sha256"])
+    result["fingerprint"] = fingerprint
+    if result["status"] == "parsed":
+        write_parsed_invoices(result, output_folder, write_only)
+    return result
+
+async def run_pipeline(pdf_paths, output_folder, cache, workers, queue_size, log_level, on_result,
+                       write_only=False, section_workers=1, triage_pages=DEFAULT_TRIAGE_PAGES):
+    """
+    Processes PDFs as three overlapping stages connected by bounded queues:
+
+    1. read:  PIPELINE_READ_THREADS threads prefetch file bytes (I/O bound,
+              worthwhile on network shares).
+    2. parse: `workers` processes run text extraction and parsing (CPU bound).
+    3. write: a single thread runs write_to_excel().
+
+    A full queue blocks the stage feeding it, so at most about
+    2 * queue_size PDFs (as bytes or parsed data) are held in memory at once.
+
+    Args:
+        pdf_paths (list): The PDFs to process.
+        output_folder (str): The folder the Excel files are written to.
+        cache (TextCache, optional): Extracted-text cache passed to parse_pdf().
+        workers (int): Number of parser processes.
+        queue_size (int): Capacity of each queue between stages.
+        log_level (str): Logging level for the parser processes.
+        on_result (callable): Called as on_result(pdf_path, result) on the event
+                              loop thread as each PDF finishes.
+        write_only (bool): Write Excel files in openpyxl's streaming write-only mode.
+        section_workers (int): Processes each parser uses for the sections or invoices of one PDF.
+        triage_pages (int): Pages decoded for vendor detection; see parse_pdf().
+    """
+    loop = asyncio.get_running_loop()
+    read_queue = asyncio.Queue(maxsize=queue_size)
+    write_queue = asyncio.Queue(maxsize=queue_size)
+    pending_paths = iter(pdf_paths) # Shared by the readers; each path is taken once
+
+    with ThreadPoolExecutor(max_workers=PIPELINE_READ_THREADS) as read_executor, \
+         ProcessPoolExecutor(max_workers=workers, initializer=configure_logging, initargs=(log_level,)) as parse_executor, \
+         ThreadPoolExecutor(max_workers=1) as write_executor:
+
+        async def read_stage():
+            for pdf_path in pending_paths:
+                try:
+                    pdf_bytes, fingerprint = await loop.run_in_executor(read_executor, read_pdf, pdf_path)
+                except OSError as e:
+                    print(f"Error reading '{pdf_path}': {e}")
+                    await write_queue.put((pdf_path, _new_result(pdf_path)))
+                    continue
+                await read_queue.put((pdf_path, pdf_bytes, fingerprint))
+
+        async def parse_stage():
+            while (item := await read_queue.get()) is not None:
+                pdf_path, pdf_bytes, fingerprint = item
+                try:
+                    result = await loop.run_in_executor(parse_executor, parse_pdf, pdf_path, pdf_bytes, cache,
+                                                          section_workers, triage_pages, fingerprint["sha256"])
+                except Exception as e:
+                    # parse_pdf catches its own errors, so this only fires if the
+                    # worker process itself died (e.g. killed or out of memory).
+                    print(f"Error processing '{os.path.basename(pdf_path)}' in worker process: {e}")
+                    result = _new_result(pdf_path)
+                result["fingerprint"] = fingerprint
+                await write_queue.put((pdf_path, result))
+
+        async def write_stage():
+            while (item := await write_queue.get()) is not None:
+                pdf_path, result = item
+                if result["status"] == "parsed":
+                    await loop.run_in_executor(write_executor, write_parsed_invoices, result, output_folder, write_only)
+                on_result(pdf_path, result)
+
+        async def feed_stage():
+            await asyncio.gather(*(read_stage() for _ in range(PIPELINE_READ_THREADS)))
+            for _ in parsers:
+                await read_queue.put(None)
+            await asyncio.gather(*parsers)
+            await write_queue.put(None)
+
+        writer = asyncio.create_task(write_stage())
+        parsers = [asyncio.create_task(parse_stage()) for _ in range(workers)]
+        feeder = asyncio.create_task(feed_stage())
+        # If the writer dies, the parsers would wait forever for room in the
+        # full write queue (and the writer for items if the feeding side dies),
+        # so the first failure cancels everything still running
+        done, pending = await asyncio.wait((feeder, writer), return_when=asyncio.FIRST_EXCEPTION)
+        if pending:
+            for task in (*pending, *parsers):
+                task.cancel()
+            await asyncio.gather(*pending, *parsers, return_exceptions=True)
+        for task in done:
+            task.result() # Re-raises the failure, if any
+
+def print_summary(results, elapsed):
+    """
+    Prints per-status counts and overall throughput for a batch run.
+    """
+    status_counts = {}
+    for result in results:
+        status_counts[result["status"]] = status_counts.get(result["status"], 0) + 1
+
+    files_per_second = len(results) / elapsed if elapsed > 0 else 0.0
+    print("\n--- Summary ---")
+    print(f"Processed {len(results)} PDF(s) in {elapsed:.2f}s ({files_per_second:.2f} files/s).")
+    for status, count in sorted(status_counts.items()):
+        print(f"  {status}: {count}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract Flipkart and Amazon invoice data from PDFs into Excel files.",
+                                     epilog="Run 'main_extractor.py classify --help' to inventory PDFs by vendor and "
+                                            "page count without parsing them.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes used to process PDFs in parallel (default: 1, sequential).")
+    parser.add_argument("--input-dir", default=input_folder,
+                        help=f"Folder containing the PDF invoices (default: {input_folder}).")
+    parser.add_argument("--output-dir", default=output_folder,
+                        help=f"Folder the Excel files are written to (default: {output_folder}).")
+    parser.add_argument("--cache-dir", default=cache_folder,
+                        help=f"Folder for the extracted-text cache (default: {cache_folder}).")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="Size cap of the extracted-text cache in MB; least recently used entries are evicted beyond it.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always decode PDFs with PyPDF2 and do not read or update the extracted-text cache.")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="WARNING", type=str.upper,
+                        help="Logging level; DEBUG shows the parsers' line-by-line diagnostics (default: WARNING).")
+    parser.add_argument("--force", action="store_true",
+                        help="Reprocess every PDF, even those the run manifest records as unchanged.")
+    parser.add_argument("--section-workers", type=int, default=1,
+                        help="Processes used to parse the sections of a single Flipkart PDF, or the invoices of a bulk Amazon PDF, "
+                             "in parallel; useful for consolidated PDFs with hundreds of them (default: 1).")
+    parser.add_argument("--triage-pages", type=int, default=DEFAULT_TRIAGE_PAGES,
+                        help="Decode only this many pages before detecting the vendor; the rest of a PDF is decoded only "
+                             f"for a known vendor. 0 detects from the whole document (default: {DEFAULT_TRIAGE_PAGES}).")
+    parser.add_argument("--write-only", action="store_true",
+                        help="Stream rows into the Excel files (openpyxl write-only mode) to keep memory flat on very large invoices.")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Overlap reading, parsing (in --workers processes) and Excel writing as separate stages.")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"In --pipeline mode, how many PDFs may wait between two stages (default: {DEFAULT_QUEUE_SIZE}).")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.section_workers < 1:
+        parser.error("--section-workers must be at least 1")
+    if args.workers > 1 and args.section_workers > 1:
+        # Every worker would start its own section pool for each PDF
+        parser.error("--section-workers cannot be combined with --workers; use one or the other")
+    if args.triage_pages < 0:
+        parser.error("--triage-pages must not be negative")
+    if args.queue_size < 1:
+        parser.error("--queue-size must be at least 1")
+    return args
+
+def classify_command(argv):
+    """
+    Runs the 'classify' subcommand; see pdf_classifier.classify_main().
+    """
+    classify_main(argv, input_folder)
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "classify":
+        classify_command(argv[1:])
+        return
+
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+    input_folder = args.input_dir
+    output_folder = args.output_dir
+
     print("--- Starting PDF processing for invoices ---")
 
     if not os.path.exists(input_folder):
@@ -31,7 +403,7 @@ def main():
     # Create output folder if it doesn't exist
     try:
         os.makedirs(output_folder, exist_ok=True)
-        print(f"Debug: Ensured output directory '{output_folder}' exists.")
+        logger.debug("Ensured output directory '%s' exists.", output_folder)
     except OSError as e:
         print(f"Error: Could not create output directory '{output_folder}'. Please check permissions. Error: {e}")
         return
@@ -43,63 +415,60 @@ def main():
         print(f"No PDF files found in '{input_folder}'. Please place your PDF invoices there.")
         return
 
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(input_folder, pdf_file)
-        print(f"\n--- Processing PDF: '{pdf_file}' ---")
+    pdf_paths = [os.path.join(input_folder, pdf_file) for pdf_file in pdf_files]
 
-        try:
-            print("Attempting to extract text from PDF...")
-            raw_text = extract_text_from_pdf(pdf_path)
-            if not raw_text:
-                print(f"Warning: No text extracted from '{pdf_file}'. Skipping.")
-                continue
-            print("Text extraction complete. Proceeding to parse invoice data.")
-
-            parsed_data = None
-            invoice_type = "Unknown"
-            
-            # Simple heuristic to determine invoice type
-            if "flipkart.com" in raw_text.lower() or "flipkart internet" in raw_text.lower():
-                invoice_type = "Flipkart"
-                print(f"Detected Flipkart invoice: '{pdf_file}'. Attempting to parse...")
-                parsed_data = parse_flipkart_invoice(raw_text)
-            elif "amazon.in" in raw_text.lower() or "amazon seller services" in raw_text.lower():
-                invoice_type = "Amazon"
-                print(f"Detected Amazon invoice: '{pdf_file}'. Attempting to parse...")
-                single_parsed_data = parse_amazon_invoice(raw_text)
-                if single_parsed_data:
-                    parsed_data = [single_parsed_data] # excel_writer expects a list
-                else:
-                    parsed_data = []
-            else:
-                print(f"Could not determine invoice type for '{pdf_file}'. Skipping.")
-                continue 
+    manifest = RunManifest(os.path.join(output_folder, MANIFEST_FILENAME))
+    manifest.prune(input_folder, pdf_paths)
+    # Which vendor is detected, if any, also depends on the pages the detection looks at
+    run_version = f"{PIPELINE_VERSION}/triage-{args.triage_pages}"
+    if not args.force:
+        pending_paths = [pdf_path for pdf_path in pdf_paths if not manifest.is_up_to_date(pdf_path, run_version)]
+        skipped_count = len(pdf_paths) - len(pending_paths)
+        if skipped_count:
+            print(f"Skipping {skipped_count} unchanged PDF(s) already recorded in the run manifest.")
+        pdf_paths = pending_paths
 
-            if parsed_data:
-                base_filename = os.path.splitext(pdf_file)[0] 
-                # Create a shorter sheet name by using the base filename and invoice type, truncate if necessary
-                # Max 20 chars of filename + type, total 31 chars
-                sheet_name_for_excel = f"{base_filename[:min(20, len(base_filename))]}_{invoice_type}" 
-                
-                output_excel_filename = f"{base_filename}_{invoice_type}_invoice.xlsx"
-                output_filepath = os.path.join(output_folder, output_excel_filename)
+    cache = None
+    if not args.no_cache:
+        cache = TextCache(os.path.join(args.cache_dir, "extracted_text.sqlite3"), args.cache_max_mb * 1024 * 1024)
+    results = []
+    start_time = time.perf_counter()
 
-                try:
-                    print(f"Attempting to write parsed data to: {output_filepath}")
-                    write_to_excel(parsed_data, output_filepath, sheet_name_for_excel) # Use the shorter sheet name
-                    print(f"Successfully wrote data from '{pdf_file}' to '{output_filepath}'")
-                except Exception as e:
-                    print(f"Error writing parsed data to Excel for '{pdf_file}': {e}")
-                    import traceback
-                    traceback.print_exc()
-            else:
-                print(f"Warning: No data parsed from {invoice_type} invoice: '{pdf_file}'.")
+    def record_result(pdf_path, result):
+        manifest.record(pdf_path, result, run_version)
+        results.append(result)
 
-        except Exception as e:
-            print(f"Error processing '{pdf_file}': {e}")
-            import traceback
-            traceback.print_exc() 
+    try:
+        if args.pipeline:
+            logger.debug("Processing %s PDFs in pipeline mode with %s parser processes.", len(pdf_paths), args.workers)
+            asyncio.run(run_pipeline(pdf_paths, output_folder, cache, args.workers, args.queue_size,
+                                     args.log_level, record_result, args.write_only, args.section_workers,
+                                     args.triage_pages))
+        elif args.workers == 1:
+            for pdf_path in pdf_paths:
+                record_result(pdf_path, process_pdf(pdf_path, output_folder, cache, args.write_only, args.section_workers,
+                                                       args.triage_pages))
+        else:
+            logger.debug("Processing %s PDFs with %s worker processes.", len(pdf_paths), args.workers)
+            with ProcessPoolExecutor(max_workers=args.workers, initializer=configure_logging, initargs=(args.log_level,)) as executor:
+                futures = {executor.submit(process_pdf, pdf_path, output_folder, cache, args.write_only,
+                                           args.section_workers, args.triage_pages): pdf_path for pdf_path in pdf_paths}
+                for future in as_completed(futures):
+                    pdf_path = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # process_pdf catches its own errors, so this only fires if the
+                        # worker process itself died (e.g. killed or out of memory).
+                        print(f"Error processing '{os.path.basename(pdf_path)}' in worker process: {e}")
+                        result = _new_result(pdf_path)
+                    record_result(pdf_path, result)
+    finally:
+        # Save even on Ctrl+C so the work done so far is not repeated next run
+        manifest.save()
 
+    elapsed = time.perf_counter() - start_time
+    print_summary(results, elapsed)
     print("\n--- PDF processing complete ---")
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_reader import extract_leading_pages
+# Importing the parsers registers their vendors with default_detector
+import extract_flipkart
+import extract_amazon
+from vendor_detector import default_detector, DEFAULT_TRIAGE_PAGES
+
+# Columns of the inventory, in CSV column order
+INVENTORY_FIELDS = ("file", "size", "pages", "vendor", "confidence", "status", "extract_seconds", "detect_seconds", "error")
+INVENTORY_FORMATS = ("jsonl", "csv")
+
+# PDFs handed to a worker process at a time; keeps inter-process overhead low
+# without queueing one future per file for archives of hundreds of thousands of PDFs.
+CLASSIFY_CHUNK_SIZE = 64
+
+def classify_pdf(pdf_path, triage_pages=DEFAULT_TRIAGE_PAGES):
+    """
+    Detects the vendor of a PDF from its first pages and counts its pages,
+    without parsing any invoice data.
+
+    This is a module-level function so it can be submitted to a
+    ProcessPoolExecutor. Every error is caught here.
+
+    Args:
+        pdf_path (str): The full path to the PDF file.
+        triage_pages (int): Pages the vendor is detected from. 0 or None detects from the whole document.
+
+    Returns:
+        dict: One inventory record with the keys in INVENTORY_FIELDS.
+              "status" is "classified", "unknown_vendor", "no_text" or "failed".
+    """
+    record = dict.fromkeys(INVENTORY_FIELDS)
+    record["file"] = pdf_path
+    record["status"] = "failed"
+    try:
+        record["size"] = os.path.getsize(pdf_path)
+
+        start_time = time.perf_counter()
+        text, record["pages"] = extract_leading_pages(pdf_path, triage_pages or None)
+        record["extract_seconds"] = round(time.perf_counter() - start_time, 4)
+        if not text.strip():
+            record["status"] = "no_text"
+            return record
+
+        start_time = time.perf_counter()
+        vendor_match = default_detector.detect(text)
+        record["detect_seconds"] = round(time.perf_counter() - start_time, 4)
+        if vendor_match is None:
+            record["status"] = "unknown_vendor"
+        else:
+            record["status"] = "classified"
+            record["vendor"] = vendor_match.vendor
+            record["confidence"] = round(vendor_match.confidence, 2)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+def iter_classified_pdfs(pdf_paths, workers=1, triage_pages=DEFAULT_TRIAGE_PAGES):
+    """
+    Classifies PDFs, in parallel if workers > 1, yielding the records in input order.
+    """
+    if workers == 1:
+        for pdf_path in pdf_paths:
+            yield classify_pdf(pdf_path, triage_pages)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(classify_pdf, pdf_paths, [triage_pages] * len(pdf_paths), chunksize=CLASSIFY_CHUNK_SIZE)
+
+def write_inventory(records, output_file, output_format):
+    """
+    Writes inventory records to an open text file as JSON lines or CSV, as they
+    arrive, and tallies them for print_inventory_summary(). Records are not
+    kept, so memory stays flat on very large archives.
+
+    Returns:
+        dict: {vendor or status: [file_count, page_count]}
+    """
+    if output_format == "csv":
+        writer = csv.DictWriter(output_file, fieldnames=INVENTORY_FIELDS)
+        writer.writeheader()
+        write_record = writer.writerow
+    else:
+        write_record = lambda record: output_file.write(json.dumps(record) + "\n")
+
+    totals = {}
+    for record in records:
+        write_record(record)
+        group_totals = totals.setdefault(record["vendor"] or record["status"], [0, 0])
+        group_totals[0] += 1
+        group_totals[1] += record["pages"] or 0
+    return totals
+
+def print_inventory_summary(totals, elapsed, file=None):
+    """
+    Prints file and page counts per vendor (or status, for unrecognized PDFs)
+    and overall throughput.
+    """
+    file_count = sum(group_files for group_files, _ in totals.values())
+    files_per_second = file_count / elapsed if elapsed > 0 else 0.0
+    print("\n--- Inventory ---", file=file)
+    print(f"Classified {file_count} PDF(s) in {elapsed:.2f}s ({files_per_second:.2f} files/s).", file=file)
+    for group, (group_files, group_pages) in sorted(totals.items()):
+        print(f"  {group}: {group_files} file(s), {group_pages} page(s)", file=file)
+
+def parse_classify_args(argv, default_input_dir):
+    parser = argparse.ArgumentParser(prog="main_extractor.py classify",
+                                     description="Inventory a folder of PDFs by vendor and page count, without parsing "
+                                                 "invoices or writing Excel files.")
+    parser.add_argument("--input-dir", default=default_input_dir,
+                        help=f"Folder containing the PDFs (default: {default_input_dir}).")
+    parser.add_argument("--output", default="-",
+                        help="Inventory file to write; '-' writes to standard output (default: -).")
+    parser.add_argument("--format", choices=INVENTORY_FORMATS, default=None,
+                        help="Inventory format (default: taken from the --output extension, else jsonl).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes used to classify PDFs in parallel (default: 1).")
+    parser.add_argument("--triage-pages", type=int, default=DEFAULT_TRIAGE_PAGES,
+                        help=f"Pages decoded to detect the vendor; 0 decodes the whole document (default: {DEFAULT_TRIAGE_PAGES}).")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.triage_pages < 0:
+        parser.error("--triage-pages must not be negative")
+    if args.format is None:
+        args.format = "csv" if args.output.lower().endswith(".csv") else "jsonl"
+    return args
+
+def classify_main(argv, default_input_dir):
+    """
+    Entry point of the 'classify' subcommand of main_extractor.py.
+
+    Args:
+        argv (list): The arguments after 'classify'.
+        default_input_dir (str): The input folder used when --input-dir is not given.
+    """
+    args = parse_classify_args(argv, default_input_dir)
+    if not os.path.exists(args.input_dir):
+        print(f"Error: Input folder '{args.input_dir}' not found.")
+        return
+
+    pdf_paths = [os.path.join(args.input_dir, f) for f in os.listdir(args.input_dir) if f.lower().endswith('.pdf')]
+    if not pdf_paths:
+        print(f"No PDF files found in '{args.input_dir}'.")
+        return
+
+    to_stdout = args.output == "-"
+    output_file = sys.stdout if to_stdout else open(args.output, 'w', encoding='utf-8', newline='')
+    start_time = time.perf_counter()
+    try:
+        totals = write_inventory(iter_classified_pdfs(pdf_paths, args.workers, args.triage_pages), output_file, args.format)
+    finally:
+        if not to_stdout:
+            output_file.close()
+
+    # Keep standard output clean for the inventory when it is written there
+    print_inventory_summary(totals, time.perf_counter() - start_time, file=sys.stderr if to_stdout else None)
+    if not to_stdout:
+        print(f"Inventory written to '{args.output}'.")
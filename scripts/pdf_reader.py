@@ -1,41 +1,236 @@
 import PyPDF2
 import os
+import io
+import hashlib
+import itertools
+import unicodedata
 
-def extract_text_from_pdf(pdf_path):
+# Unicode normal form every extracted page text is brought into; see normalize_text()
+TEXT_NORMALIZATION = "NFKC"
+
+# Part of the text cache key. Bump the suffix whenever the way page text is
+# extracted changes, so cached text from the old extractor is not reused.
+TEXT_EXTRACTOR_VERSION = f"PyPDF2-{PyPDF2.__version__}/2+{TEXT_NORMALIZATION}"
+
+# NFKC already turns non-breaking, en/em, thin and ideographic spaces into a
+# plain space. These are the exotic spaces it leaves alone (folded to a plain
+# space) and the zero-width characters (dropped).
+_SPACE_FOLD_TABLE = str.maketrans({"\u1680": " ", "\u200b": None, "\u2060": None, "\ufeff": None})
+_SPACE_FOLD_TABLE_CHARS = tuple(chr(code) for code in _SPACE_FOLD_TABLE)
+
+def normalize_text(text):
     """
-    Extracts all text from a given PDF file.
+    Applies Unicode NFKC normalization and folds exotic spaces to plain
+    spaces, so the parsers can match plain ASCII spaces and punctuation
+    (e.g. full-width letters and ligatures become their plain forms)
+    instead of allowing for every variant in each pattern.
+
+    Args:
+        text (str): Text as extracted by PyPDF2.
+
+    Returns:
+        str: The normalized text.
+    """
+    text = unicodedata.normalize(TEXT_NORMALIZATION, text)
+    # str.translate() with a dict table is slow on non-ASCII text, so only
+    # run it on the rare page that has one of its characters
+    if not text.isascii() and any(char in text for char in _SPACE_FOLD_TABLE_CHARS):
+        text = text.translate(_SPACE_FOLD_TABLE)
+    return text
+
+def iter_page_texts(pdf_path, pdf_bytes=None, first_page=1):
+    """
+    Lazily yields the text of each page of a PDF, one page at a time,
+    normalized by normalize_text().
+
+    Pages are only decoded as the caller asks for them, so a parser can start
+    working on page 1 before the last page of a large document is decoded.
+    The file stays open until the generator is exhausted or closed.
 
     Args:
         pdf_path (str): The full path to the PDF file.
+        pdf_bytes (bytes, optional): The PDF content, if the caller has already
+                                     read it. pdf_path is then not opened.
+        first_page (int, optional): The 1-based page to start at; earlier pages are not decoded.
+
+    Yields:
+        tuple: (page_number, text) with 1-based page numbers.
+
+    Raises:
+        FileNotFoundError, PyPDF2.errors.PdfReadError: Errors are not caught
+        here; extract_text_from_pdf() handles them for callers that want the
+        old "return None on failure" behaviour.
+    """
+    with (io.BytesIO(pdf_bytes) if pdf_bytes is not None else open(pdf_path, 'rb')) as file:
+        # Create a PdfReader object to read the PDF
+        reader = PyPDF2.PdfReader(file)
+        for page_num, page in enumerate(itertools.islice(reader.pages, first_page - 1, None), start=first_page):
+            yield page_num, normalize_text(page.extract_text())
+
+def extract_leading_pages(pdf_path, max_pages, pdf_bytes=None):
+    """
+    Extracts the normalized text of the first max_pages pages and counts all
+    pages, without decoding the content of the pages after them.
+
+    Args:
+        pdf_path (str): The full path to the PDF file.
+        max_pages (int): The number of pages to extract text from.
+        pdf_bytes (bytes, optional): The PDF content, if the caller has already read it.
 
     Returns:
-        str: A single string containing all extracted text,
+        tuple: (text, page_count), with each page's text followed by a newline.
+
+    Raises:
+        FileNotFoundError, PyPDF2.errors.PdfReadError: As iter_page_texts().
+    """
+    with (io.BytesIO(pdf_bytes) if pdf_bytes is not None else open(pdf_path, 'rb')) as file:
+        reader = PyPDF2.PdfReader(file)
+        pages = reader.pages
+        text = "".join(normalize_text(page.extract_text()) + "\n" for page in itertools.islice(pages, max_pages))
+        return text, len(pages)
+
+def iter_cached_page_texts(pdf_path, cache=None, pdf_bytes=None, pdf_sha256=None):
+    """
+    Yields the text of each page of a PDF, served from the text cache when
+    possible and decoded lazily with PyPDF2 otherwise.
+
+    Pages are read from and written to the cache one at a time, so at most
+    one page is held here. Freshly decoded pages only become a cache entry
+    once the last page has been read; if the caller stops early (e.g. after
+    looking at page 1), the pages stored so far are removed again.
+
+    Args:
+        pdf_path (str): The full path to the PDF file.
+        cache (TextCache, optional): Page-text cache keyed by the SHA-256 of the PDF bytes.
+        pdf_bytes (bytes, optional): The PDF content, if the caller has already read it.
+        pdf_sha256 (str, optional): Hex SHA-256 of the PDF bytes, if the caller
+                                    has already computed it (e.g. for the run manifest).
+
+    Yields:
+        str: The text of each page, in order.
+
+    Raises:
+        The errors of iter_page_texts().
+    """
+    if cache is None:
+        for _, page_text in iter_page_texts(pdf_path, pdf_bytes=pdf_bytes):
+            yield page_text
+        return
+
+    if pdf_sha256 is None:
+        if pdf_bytes is None:
+            with open(pdf_path, 'rb') as file:
+                pdf_bytes = file.read()
+        pdf_sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+    key = cache.make_key(pdf_sha256, TEXT_EXTRACTOR_VERSION)
+    page_count = cache.page_count(key)
+    if page_count is not None:
+        for page_number in range(1, page_count + 1):
+            page_text = cache.get_page(key, page_number)
+            if page_text is None:
+                # Evicted by another process meanwhile: decode the remaining pages
+                for _, page_text in iter_page_texts(pdf_path, pdf_bytes=pdf_bytes, first_page=page_number):
+                    yield page_text
+                return
+            yield page_text
+        return
+
+    cached = False
+    caching = True # Until the cache fails to store a page
+    page_count = 0
+    try:
+        for page_count, page_text in iter_page_texts(pdf_path, pdf_bytes=pdf_bytes):
+            caching = caching and cache.put_page(key, page_count, page_text)
+            yield page_text
+        if caching:
+            cache.put_entry(key, page_count)
+            cached = True
+    finally:
+        if not cached:
+            cache.discard_pages(key)
+
+class PdfTextError(Exception):
+    """
+    Raised by iter_page_chunks() when the text of a PDF could not be
+    extracted. The reason has already been printed.
+    """
+
+def iter_page_chunks(page_texts, pdf_path, max_pages=None):
+    """
+    Reads up to max_pages pages (all remaining pages by default) from a page
+    text iterator and yields each page's text followed by a newline, the way
+    join_page_texts() joins them. The iterator can be passed in again to read
+    on from where the previous call stopped.
+
+    Args:
+        page_texts (iterator): E.g. from iter_cached_page_texts().
+        pdf_path (str): The PDF the pages come from, used in error messages.
+        max_pages (int, optional): The maximum number of pages to read.
+
+    Yields:
+        str: Each page text plus its newline separator.
+
+    Raises:
+        PdfTextError: If reading a page failed; the error has been printed.
+    """
+    pages = itertools.islice(page_texts, max_pages)
+    while True:
+        try:
+            page_text = next(pages, None)
+        except PyPDF2.errors.PdfReadError as e:
+            print(f"Error reading PDF '{pdf_path}': {e}. The file might be encrypted or corrupted.")
+            raise PdfTextError(str(e)) from e
+        except FileNotFoundError as e:
+            print(f"Error: PDF file not found at '{pdf_path}'")
+            raise PdfTextError(str(e)) from e
+        except Exception as e:
+            # Catch any other unexpected errors during text extraction
+            print(f"An unexpected error occurred while extracting text from '{pdf_path}': {e}")
+            raise PdfTextError(str(e)) from e
+        if page_text is None:
+            return
+        # A newline character is added to separate text from different pages,
+        # which can help in distinguishing content across pages during parsing.
+        yield page_text + "\n"
+
+def join_page_texts(page_texts, pdf_path, max_pages=None):
+    """
+    Reads up to max_pages pages (all remaining pages by default) from a page
+    text iterator and joins them into one string. The iterator can be passed
+    in again to read on from where the previous call stopped.
+
+    Args:
+        page_texts (iterator): E.g. from iter_cached_page_texts().
+        pdf_path (str): The PDF the pages come from, used in error messages.
+        max_pages (int, optional): The maximum number of pages to read.
+
+    Returns:
+        str: The page texts, each followed by a newline,
              or None if an error occurs during extraction.
     """
-    text = ""
     try:
-        with open(pdf_path, 'rb') as file:
-            # Create a PdfReader object to read the PDF
-            reader = PyPDF2.PdfReader(file)
-            
-            # Iterate through each page of the PDF
-            for page_num in range(len(reader.pages)):
-                page = reader.pages[page_num]
-                # Extract text from the current page and append it
-                # A newline character is added to separate text from different pages,
-                # which can help in distinguishing content across pages during parsing.
-                text += page.extract_text() + "\n" 
-    except PyPDF2.errors.PdfReadError as e:
-        print(f"Error reading PDF '{pdf_path}': {e}. The file might be encrypted or corrupted.")
-        return None
-    except FileNotFoundError:
-        print(f"Error: PDF file not found at '{pdf_path}'")
-        return None
-    except Exception as e:
-        # Catch any other unexpected errors during text extraction
-        print(f"An unexpected error occurred while extracting text from '{pdf_path}': {e}")
+        # Joining once avoids re-copying the growing string for every page
+        return "".join(iter_page_chunks(page_texts, pdf_path, max_pages))
+    except PdfTextError:
         return None
-    return text
+
+def extract_text_from_pdf(pdf_path, cache=None, pdf_bytes=None):
+    """
+    Extracts all text from a given PDF file.
+
+    Args:
+        pdf_path (str): The full path to the PDF file.
+        cache (TextCache, optional): If given, page texts are looked up by the
+                                     SHA-256 of the PDF bytes before PyPDF2 is
+                                     used, and stored after a fresh extraction.
+        pdf_bytes (bytes, optional): The PDF content, if the caller has already
+                                     read it. pdf_path is then only used in messages.
+
+    Returns:
+        str: A single string containing all extracted text,
+             or None if an error occurs during extraction.
+    """
+    return join_page_texts(iter_cached_page_texts(pdf_path, cache, pdf_bytes), pdf_path)
 
 # This block allows you to test the pdf_reader.py script independently.
 # It will only run if you execute this file directly (e.g., python scripts/pdf_reader.py)
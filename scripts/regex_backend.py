@@ -0,0 +1,81 @@
+import os
+import re
+import signal
+import threading
+
+try:
+    import re2 # Optional: pip install google-re2
+except ImportError:
+    re2 = None
+
+# Choose the engine for the parser patterns with INVOICE_REGEX_BACKEND=re2 (default: re).
+# The choice is read once, when the parser modules compile their patterns at import time.
+# Note that under RE2, \s and \d only match ASCII whitespace and digits.
+REGEX_BACKEND = os.environ.get("INVOICE_REGEX_BACKEND", "re").strip().lower()
+
+# Default per-match time budget for item-matching searches (seconds)
+MATCH_TIME_BUDGET_SECONDS = 2.0
+
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+class RegexTimeout(Exception):
+    """
+    Raised by search_with_budget() when a search runs past its time budget.
+    """
+
+def compile_pattern(pattern, flags=0):
+    """
+    Compiles a parser pattern with the configured regex backend.
+
+    With the RE2 backend, patterns run in linear time. RE2 does not support
+    lookarounds or backreferences, so patterns that use them (or any pattern
+    RE2 rejects) silently fall back to Python's re module.
+
+    Args:
+        pattern (str): The regular expression.
+        flags (int): re.IGNORECASE, re.MULTILINE and/or re.DOTALL.
+
+    Returns:
+        A compiled pattern object with search()/match()/findall().
+    """
+    if REGEX_BACKEND == "re2" and re2 is not None:
+        inline_flags = "".join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+        options = re2.Options()
+        options.log_errors = False # A rejected pattern is expected; we fall back quietly
+        try:
+            return re2.compile(f"(?{inline_flags}){pattern}" if inline_flags else pattern, options)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+def _raise_timeout(signum, frame):
+    raise RegexTimeout()
+
+def _alarm_available():
+    # SIGALRM only exists on POSIX and can only be handled in the main thread.
+    # Do not take over a timer that someone else has already armed.
+    return (hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+            and signal.getitimer(signal.ITIMER_REAL)[0] == 0)
+
+def search_with_budget(compiled_pattern, text, budget_seconds=MATCH_TIME_BUDGET_SECONDS):
+    """
+    Runs compiled_pattern.search(text), giving up after budget_seconds.
+
+    Python's re engine checks for signals while it backtracks, so a SIGALRM
+    timer can interrupt a runaway search. Where no timer is available
+    (Windows, non-main threads) the search runs without a budget.
+
+    Raises:
+        RegexTimeout: If the search did not finish within the budget.
+    """
+    if not budget_seconds or not _alarm_available():
+        return compiled_pattern.search(text)
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, budget_seconds)
+    try:
+        return compiled_pattern.search(text)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
@@ -0,0 +1,149 @@
+import os
+import json
+import hashlib
+
+MANIFEST_FILENAME = ".invoice_manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+
+def fingerprint_bytes(file_bytes, stat):
+    """
+    Builds the same fingerprint as fingerprint_file() from content that has
+    already been read, plus the os.stat() result taken before reading it.
+    """
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": hashlib.sha256(file_bytes).hexdigest()}
+
+def fingerprint_file(file_path, chunk_size=1024 * 1024):
+    """
+    Computes the size, modification time and SHA-256 of a file.
+
+    Returns:
+        dict: {"size": ..., "mtime_ns": ..., "sha256": "..."}
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+
+class RunManifest:
+    """
+    Persistent record of which input PDFs have already been processed, so
+    unchanged inputs can be skipped on the next run.
+
+    Each entry is keyed by the absolute input path and stores the input's
+    size, mtime, content hash, the parser version that processed it, the
+    result status and the output file (with its size and mtime at write time).
+    An entry is only trusted if the input, the parser version and the output
+    file all still match.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read run manifest '{self.manifest_path}': {e}. All inputs will be reprocessed.")
+            return
+        if data.get("format_version") == MANIFEST_FORMAT_VERSION:
+            self.entries = data.get("entries", {})
+
+    def is_up_to_date(self, pdf_path, parser_version):
+        """
+        Checks whether pdf_path was already processed by parser_version and its
+        output is still in place.
+
+        A matching size and mtime are trusted as-is. If only the mtime changed
+        (e.g. the file was copied or touched), the content hash decides.
+
+        Returns:
+            bool: True if the input can be skipped.
+        """
+        entry = self.entries.get(os.path.abspath(pdf_path))
+        if not entry or entry.get("parser_version") != parser_version:
+            return False
+
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return False
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            if fingerprint_file(pdf_path)["sha256"] != entry["sha256"]:
+                return False
+            entry["mtime_ns"] = stat.st_mtime_ns # Same content, remember the new mtime
+
+        output_path = entry.get("output")
+        if output_path:
+            try:
+                output_stat = os.stat(output_path)
+            except OSError:
+                return False
+            if output_stat.st_size != entry["output_size"] or output_stat.st_mtime_ns != entry["output_mtime_ns"]:
+                return False
+        return True
+
+    def record(self, pdf_path, result, parser_version):
+        """
+        Stores the outcome of processing pdf_path. Failed runs are not recorded,
+        so those inputs are retried next time.
+
+        Args:
+            pdf_path (str): The input PDF path.
+            result (dict): The summary returned by main_extractor.process_pdf(),
+                           including its "fingerprint" of the input.
+            parser_version (str): The parser version that produced the result.
+        """
+        key = os.path.abspath(pdf_path)
+        fingerprint = result.get("fingerprint")
+        if result["status"] == "failed" or not fingerprint:
+            self.entries.pop(key, None)
+            return
+
+        entry = dict(fingerprint)
+        entry["parser_version"] = parser_version
+        entry["status"] = result["status"]
+        entry["output"] = None
+        if result.get("output"):
+            try:
+                output_stat = os.stat(result["output"])
+            except OSError:
+                self.entries.pop(key, None)
+                return
+            entry["output"] = os.path.abspath(result["output"])
+            entry["output_size"] = output_stat.st_size
+            entry["output_mtime_ns"] = output_stat.st_mtime_ns
+        self.entries[key] = entry
+
+    def prune(self, input_dir, pdf_paths):
+        """
+        Drops the entries for PDFs in input_dir that are no longer among
+        pdf_paths. Entries for other input folders that share the same output
+        folder (and so the same manifest) are kept.
+
+        Args:
+            input_dir (str): The folder the current run lists its PDFs from.
+            pdf_paths (list): The PDFs currently in input_dir.
+        """
+        input_dir = os.path.abspath(input_dir)
+        keep = {os.path.abspath(pdf_path) for pdf_path in pdf_paths}
+        self.entries = {key: entry for key, entry in self.entries.items()
+                        if key in keep or os.path.dirname(key) != input_dir}
+
+    def save(self):
+        """
+        Writes the manifest atomically (temporary file + rename), so an
+        interrupted save never leaves a truncated manifest behind.
+        """
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"format_version": MANIFEST_FORMAT_VERSION, "entries": self.entries}, file)
+        os.replace(temp_path, self.manifest_path)
@@ -0,0 +1,202 @@
+import os
+import time
+import zlib
+import sqlite3
+
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024 # 1 GiB of compressed page text
+# Pages not claimed by an entry for this long are treated as abandoned
+ORPHAN_PAGE_SECONDS = 24 * 60 * 60
+
+class TextCache:
+    """
+    On-disk cache of extracted PDF page texts, stored in a single SQLite database.
+
+    Entries are keyed by the SHA-256 of the PDF bytes plus the text extractor
+    version, so a renamed or copied file still hits the cache, while an
+    upgraded extractor never serves stale text. Each page text is stored
+    zlib-compressed in its own row, so a document can be written and read
+    one page at a time. Once the total compressed size exceeds max_bytes,
+    the least recently used entries are evicted.
+
+    The SQLite connection is opened lazily and is not pickled, so a TextCache
+    can be passed to worker processes; each process opens its own connection.
+    """
+
+    def __init__(self, db_path, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        """
+        Args:
+            db_path (str): Path of the SQLite database file. Its folder is created if needed.
+            max_bytes (int): Size cap for the stored (compressed) page texts.
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._conn = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None # sqlite3 connections cannot cross process boundaries
+        return state
+
+    @staticmethod
+    def make_key(pdf_sha256, extractor_version):
+        """
+        Builds the cache key for a PDF and extractor version.
+
+        Args:
+            pdf_sha256 (str): Hex SHA-256 of the PDF bytes, e.g. the one the run
+                              manifest fingerprint already holds.
+            extractor_version (str): The text extractor version.
+        """
+        return f"{pdf_sha256}:{extractor_version}"
+
+    def _connect(self):
+        if self._conn is None:
+            cache_dir = os.path.dirname(self.db_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            # WAL lets several worker processes read while one of them writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Earlier versions stored each document as one blob
+            conn.execute("DROP TABLE IF EXISTS page_texts")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, page_count INTEGER NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "key TEXT NOT NULL, page_number INTEGER NOT NULL, data BLOB NOT NULL, size INTEGER NOT NULL, "
+                "written_at REAL NOT NULL, PRIMARY KEY (key, page_number))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def page_count(self, key):
+        """
+        Looks up the entry stored under key and marks it as recently used.
+
+        Returns:
+            int: The number of pages stored under key, or None on a cache miss
+                 or if the cache is unusable.
+        """
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT page_count FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read from text cache '{self.db_path}': {e}")
+            return None
+
+    def get_page(self, key, page_number):
+        """
+        Returns the text of one page (1-based) stored under key, or None if it
+        is not there (e.g. evicted by another process since page_count()).
+        """
+        try:
+            row = self._connect().execute("SELECT data FROM pages WHERE key = ? AND page_number = ?",
+                                          (key, page_number)).fetchone()
+            return None if row is None else zlib.decompress(row[0]).decode("utf-8")
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"Warning: Could not read from text cache '{self.db_path}': {e}")
+            return None
+
+    def put_page(self, key, page_number, page_text):
+        """
+        Stores the text of one page (1-based) under key. The pages are only
+        served once put_entry() records how many there are.
+
+        Returns:
+            bool: False if the cache is unusable.
+        """
+        data = zlib.compress(page_text.encode("utf-8"))
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (key, page_number, data, size, written_at) VALUES (?, ?, ?, ?, ?)",
+                (key, page_number, data, len(data), time.time())
+            )
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write to text cache '{self.db_path}': {e}")
+            return False
+
+    def put_entry(self, key, page_count):
+        """
+        Makes the page_count pages stored under key available, then evicts
+        least recently used entries until the cache is back under its size cap.
+        """
+        try:
+            conn = self._connect()
+            size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages WHERE key = ? AND page_number <= ?",
+                                (key, page_count)).fetchone()[0]
+            conn.execute("DELETE FROM pages WHERE key = ? AND page_number > ?", (key, page_count))
+            conn.execute("INSERT OR REPLACE INTO entries (key, page_count, size, last_access) VALUES (?, ?, ?, ?)",
+                         (key, page_count, size, time.time()))
+            self._evict(conn)
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write to text cache '{self.db_path}': {e}")
+
+    def discard_pages(self, key):
+        """
+        Removes the pages stored under key unless an entry claims them, e.g.
+        those of an extraction that was abandoned before put_entry().
+        """
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM pages WHERE key = ? AND key NOT IN (SELECT key FROM entries)", (key,))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write to text cache '{self.db_path}': {e}")
+
+    def get(self, key):
+        """
+        Looks up all page texts stored under key and marks the entry as recently used.
+
+        Returns:
+            list: The page texts, or None on a cache miss or if the cache is unusable.
+        """
+        page_count = self.page_count(key)
+        if page_count is None:
+            return None
+        page_texts = [self.get_page(key, page_number) for page_number in range(1, page_count + 1)]
+        return None if None in page_texts else page_texts
+
+    def put(self, key, page_texts):
+        """
+        Stores all page texts of a document under key; see put_page() and put_entry().
+        """
+        for page_number, page_text in enumerate(page_texts, start=1):
+            if not self.put_page(key, page_number, page_text):
+                return
+        self.put_entry(key, len(page_texts))
+
+    def _evict(self, conn):
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        # Pages without an entry that are older than a write could take were
+        # left behind by a run that was killed mid-extraction
+        conn.execute("DELETE FROM pages WHERE written_at < ? AND key NOT IN (SELECT key FROM entries)",
+                     (time.time() - ORPHAN_PAGE_SECONDS,))
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        keys_to_delete = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            if total_size <= self.max_bytes:
+                break
+            keys_to_delete.append((key,))
+            total_size -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", keys_to_delete)
+        conn.executemany("DELETE FROM pages WHERE key = ?", keys_to_delete)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
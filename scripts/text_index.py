@@ -0,0 +1,56 @@
+class TextIndex:
+    """
+    Line index over the text of one invoice (or one section of a Flipkart
+    document), built once and shared by the header, section and item scans
+    of its parser, so they no longer each re-split the text and re-strip or
+    re-normalize every line they look at.
+
+    Attributes:
+        lines (list): The lines of the text, as by str.splitlines().
+        stripped_lines (list): Each line without surrounding whitespace.
+
+    Lines are only normalized as far as a caller reads them.
+    """
+
+    def __init__(self, text):
+        self._set_lines(text.splitlines())
+
+    @classmethod
+    def from_range(cls, text, start, end, leading_lines=()):
+        """
+        Indexes the lines of text[start:end], preceded by leading_lines,
+        without keeping a copy of that part of the text.
+
+        Args:
+            text (str): The whole document, shared by all ranges.
+            start (int): Offset at which the range begins.
+            end (int): Offset at which the range ends.
+            leading_lines (iterable): Extra lines placed before the range's lines.
+
+        Returns:
+            TextIndex: An index whose lines are
+                       list(leading_lines) + text[start:end].splitlines().
+        """
+        lines = list(leading_lines)
+        lines.extend(text[start:end].splitlines())
+        index = cls.__new__(cls)
+        index._set_lines(lines)
+        return index
+
+    def _set_lines(self, lines):
+        self.lines = lines
+        self.stripped_lines = [line.strip() for line in lines]
+        self._normalized_lines = []
+
+    def iter_normalized_lines(self):
+        """
+        Yields each line with whitespace runs collapsed to single spaces and
+        lowercased, for case-insensitive keyword searches such as table
+        headers. Lines are normalized as they are read and kept, so a search
+        that stops early does not pay for the rest of the text.
+        """
+        normalized_lines = self._normalized_lines
+        for line_index, line in enumerate(self.lines):
+            if line_index == len(normalized_lines):
+                normalized_lines.append(" ".join(line.split()).lower())
+            yield normalized_lines[line_index]
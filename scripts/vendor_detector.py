@@ -0,0 +1,119 @@
+import re
+import collections
+
+# The result of VendorDetector.detect()
+VendorMatch = collections.namedtuple("VendorMatch", ["vendor", "confidence", "parser", "matched_fingerprints", "stream_parser"])
+
+# What VendorDetector keeps per registered vendor
+_RegisteredVendor = collections.namedtuple("_RegisteredVendor", ["fingerprints", "parser", "stream_parser", "priority", "version"])
+
+class VendorDetector:
+    """
+    Registry of invoice vendors and the text fingerprints that identify them.
+
+    Each parser module registers its vendor name, a few lowercase
+    fingerprints (e.g. "flipkart.com") and its parse function. detect()
+    lowercases the document once and finds every fingerprint of every vendor
+    in a single scan with one compiled alternation, so adding a vendor adds
+    no extra pass over the text.
+    """
+
+    def __init__(self):
+        self._vendors = {} # vendor name -> _RegisteredVendor, in registration order
+        self._fingerprint_vendor = {} # fingerprint -> vendor name
+        self._pattern = None
+
+    def register(self, vendor, fingerprints, parser, stream_parser=None, priority=0, version=None):
+        """
+        Adds a vendor, or replaces the fingerprints and parser of one already registered.
+
+        Args:
+            vendor (str): The vendor name, e.g. "Flipkart". Also used in output file names.
+            fingerprints (iterable): Substrings that identify the vendor's
+                                     documents. Matched case-insensitively.
+            parser (callable): Called as parser(text, workers) to parse a
+                               document of this vendor into a list of invoices.
+            stream_parser (callable, optional): Called as stream_parser(text_chunks)
+                               with the document text in chunks (e.g. per page,
+                               as it is decoded); yields the same invoices as
+                               parser. Used instead of parser when the invoices
+                               are parsed in the calling process.
+            priority (int, optional): Vendors with a higher priority win over
+                               any vendor with a lower one whose fingerprints
+                               also occur, e.g. when a Flipkart invoice
+                               mentions amazon.in. Defaults to 0.
+            version (str, optional): The parser version, reported by version_key().
+        """
+        fingerprints = tuple(dict.fromkeys(fingerprint.lower() for fingerprint in fingerprints))
+        for fingerprint in fingerprints:
+            owner = self._fingerprint_vendor.get(fingerprint)
+            if owner is not None and owner != vendor:
+                raise ValueError(f"Fingerprint '{fingerprint}' is already registered for {owner}")
+        self._vendors[vendor] = _RegisteredVendor(fingerprints, parser, stream_parser, priority, version)
+        self._fingerprint_vendor = {fingerprint: name
+                                    for name, registered in self._vendors.items()
+                                    for fingerprint in registered.fingerprints}
+        self._pattern = None # Rebuilt on the next detect()
+
+    def version_key(self):
+        """
+        Names the registered vendors with their parser versions, e.g.
+        "Amazon-5+Flipkart-3", so results recorded under another set of
+        vendors or parsers can be told apart.
+        """
+        return "+".join(f"{vendor}-{registered.version}" for vendor, registered in sorted(self._vendors.items()))
+
+    def _get_pattern(self):
+        if self._pattern is None:
+            # Longest first, so a fingerprint that extends another is not hidden by it
+            fingerprints = sorted(self._fingerprint_vendor, key=len, reverse=True)
+            self._pattern = re.compile("|".join(re.escape(fingerprint) for fingerprint in fingerprints))
+        return self._pattern
+
+    def detect(self, text):
+        """
+        Finds the vendor whose fingerprints best match the text.
+
+        The confidence of a vendor is the share of its fingerprints found in
+        the text. Among the vendors with at least one fingerprint found, the
+        one with the highest priority wins, then the one with the highest
+        confidence; on a tie, the one registered first.
+
+        Returns:
+            VendorMatch: (vendor, confidence, parser, matched_fingerprints, stream_parser),
+                         or None if no fingerprint occurs in the text.
+        """
+        if not self._vendors:
+            return None
+
+        found = set()
+        for match in self._get_pattern().finditer(text.lower()):
+            found.add(match.group(0))
+            if len(found) == len(self._fingerprint_vendor):
+                break # Every fingerprint seen, the rest of the text cannot change the result
+
+        best_match = None
+        best_priority = None
+        for vendor, registered in self._vendors.items():
+            matched_fingerprints = tuple(fingerprint for fingerprint in registered.fingerprints if fingerprint in found)
+            if not matched_fingerprints:
+                continue
+            confidence = len(matched_fingerprints) / len(registered.fingerprints)
+            if best_match is None or (registered.priority, confidence) > (best_priority, best_match.confidence):
+                best_match = VendorMatch(vendor, confidence, registered.parser, matched_fingerprints,
+                                         registered.stream_parser)
+                best_priority = registered.priority
+        return best_match
+
+# Pages decoded for vendor detection before the rest of a PDF is touched.
+# Two rather than one, because re-shared invoices often start with a download cover page.
+DEFAULT_TRIAGE_PAGES = 2
+
+# Registry the parser modules add themselves to when they are imported
+default_detector = VendorDetector()
+
+def register_vendor(vendor, fingerprints, parser, stream_parser=None, priority=0, version=None):
+    """
+    Registers a vendor with the default detector; see VendorDetector.register().
+    """
+    default_detector.register(vendor, fingerprints, parser, stream_parser, priority, version)
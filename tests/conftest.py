@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules under test live in scripts/ and import each other by bare name,
+# the same way main_extractor.py puts that folder on the path.
+scripts_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
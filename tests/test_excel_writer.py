@@ -0,0 +1,96 @@
+import pytest
+from openpyxl import load_workbook
+
+from excel_writer import (
+    ColumnWidthTracker,
+    HEADERS,
+    CELL_STYLE_NAME,
+    HEADER_STYLE_NAME,
+    sanitize_excel_cell_value,
+    sanitize_excel_row,
+    write_to_excel,
+)
+from invoice_models import Invoice, LineItem
+
+def test_sanitize_excel_row_matches_cell_sanitizer():
+    row = [None, "  Tax Invoice\r\n", "OD\x01123\x0b", 15865.0, "₹ 1,149.00\n\n", ""]
+    assert sanitize_excel_row(row) == [sanitize_excel_cell_value(value) for value in row]
+    assert sanitize_excel_row(row) == ["", "Tax Invoice", "OD123", "15865.0", "₹ 1,149.00", ""]
+
+def test_sanitize_excel_row_value_containing_nul():
+    # NUL separates the values internally, so a value holding one must not split the row
+    assert sanitize_excel_row(["a\x00b", "c"]) == ["ab", "c"]
+
+def test_sanitize_excel_row_empty():
+    assert sanitize_excel_row([]) == []
+
+@pytest.mark.parametrize("value, sanitized", [
+    (None, ""),
+    ("  Tax\x00 Invoice\x07 ", "Tax Invoice"),
+    ("Line one\r\nLine two\nthree\rfour", "Line one Line two three four"),
+    ("₹ 1,149.00 – Café Crème\t", "₹ 1,149.00 – Café Crème"),
+    ("bad\ud800\ufffe\uffff", "bad"),
+    (15865.0, "15865.0"),
+])
+def test_sanitize_excel_cell_value(value, sanitized):
+    assert sanitize_excel_cell_value(value) == sanitized
+
+def test_column_width_tracker():
+    tracker = ColumnWidthTracker(["Qty", "Description"])
+    tracker.update([12345, None])
+    tracker.update([1, "Apple iPhone 13", "extra column"])
+    assert tracker.widths() == [7, 17, 14]
+
+def test_column_width_tracker_sample_rows_and_max_width():
+    tracker = ColumnWidthTracker(["Qty", "Description"], sample_rows=1, max_width=10)
+    tracker.update([1, "Apple iPhone 13"])
+    tracker.update(["A much longer value than any other", ""]) # Past the sample, not measured
+    assert tracker.widths() == [5, 10]
+
+_INVOICES = [
+    Invoice(invoice_type="Tax Invoice", invoice_number="FAJ2J42400074476", order_id="OD430583065372371100",
+            invoice_date="27-02-2024", total_amount=13065.0,
+            items=[LineItem("realme 11 5G (Glory Black,\n256 GB)", 1, 17999.0, 15865.0),
+                   LineItem("Shipping And Handling Charges", 1, 70.0, 0.0)]),
+    Invoice(invoice_type="Debit Note", invoice_number="DD2I8K2400036414", order_id="OD430583065372371100",
+            invoice_date="27-02-2024"),
+]
+
+_EXPECTED_ROWS = [
+    tuple(HEADERS),
+    ("Tax Invoice", "FAJ2J42400074476", "OD430583065372371100", "27-02-2024", 13065,
+     "realme 11 5G (Glory Black, 256 GB)", 1, 17999, 15865),
+    ("Tax Invoice", "FAJ2J42400074476", "OD430583065372371100", "27-02-2024", 13065,
+     "Shipping And Handling Charges", 1, 70, 0),
+    ("Debit Note", "DD2I8K2400036414", "OD430583065372371100", "27-02-2024", None, None, None, None, None),
+]
+
+@pytest.mark.parametrize("write_only", [False, True])
+def test_write_to_excel_round_trip(tmp_path, write_only):
+    output_path = str(tmp_path / "invoices.xlsx")
+    # Write-only mode takes any iterable, so feed it a generator
+    invoices = iter(_INVOICES) if write_only else _INVOICES
+    write_to_excel(invoices, output_path, "Invoices", write_only=write_only, max_column_width=30)
+
+    ws = load_workbook(output_path)["Invoices"]
+    assert list(ws.iter_rows(values_only=True)) == _EXPECTED_ROWS
+
+    header_cell = ws["A1"]
+    assert header_cell.font.bold
+    assert header_cell.fill.start_color.rgb.endswith("4F81BD")
+    assert header_cell.alignment.horizontal == "center"
+    for row in ws.iter_rows(min_row=1, max_row=ws.max_row):
+        for cell in row:
+            assert cell.border.left.style == cell.border.bottom.style == "thin"
+
+    widths = [ws.column_dimensions[letter].width for letter in "ABCDEFGHI"]
+    assert widths == [14, 18, 22, 14, 14, 30, 15, 17, 18]
+
+def test_write_only_cells_share_named_styles(tmp_path):
+    output_path = str(tmp_path / "invoices.xlsx")
+    write_to_excel(_INVOICES, output_path, write_only=True)
+    workbook = load_workbook(output_path)
+    assert {HEADER_STYLE_NAME, CELL_STYLE_NAME} <= set(workbook.named_styles)
+    ws = workbook["Invoices"]
+    assert ws["A1"].style == HEADER_STYLE_NAME
+    assert ws["F2"].style == CELL_STYLE_NAME
@@ -0,0 +1,108 @@
+import logging
+import os
+
+from extract_amazon import _extract_total_amount, _iter_item_rows, parse_amazon_invoices, split_amazon_invoices
+from pdf_reader import extract_text_from_pdf
+
+INPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "Input_pdfs")
+
+
+def _total(text, item_section_end_line_index=0):
+    return _extract_total_amount(text, text.splitlines(), item_section_end_line_index)
+
+def test_total_is_the_number_ending_the_text():
+    text = "HSN:8517₹29,463.39 1₹29,463.39 12%IGST₹3,535.61₹32,999.00\nTOTAL: ₹3,535.61₹32,999.00\n  "
+    assert _total(text, 1) == "32999.00"
+
+def test_total_label_may_be_on_any_line():
+    # The label is looked up in the whole text when the item table ended elsewhere
+    text = "TOTAL:\nAmount in Words:\n₹ 32,999.00"
+    assert _total(text, 1) == "32999.00"
+
+def test_total_from_quoted_csv_value():
+    assert _total('Item\nTOTAL:,"1,234.50"', 1) == "1234.50"
+
+def test_grand_total_fallback():
+    text = "TOTAL: 5\nGrand Total: ₹ 1,499.00\nThank you"
+    assert _total(text) == "1499.00"
+
+def test_trailing_number_needs_a_total_label():
+    assert _total("Page 1 of 12") == ""
+
+def test_no_total():
+    assert _total("TOTAL: ₹3,535.61₹32,999.00\nAmount in Words:") == ""
+    assert _total("") == ""
+
+def test_item_row_on_one_line():
+    lines = [
+        "1Apple iPhone 13 (128GB) - (Product) RED |",
+        "B09G99CW2N ( B09G99CW2N )",
+        "HSN:85171300₹63,474.58 1₹63,474.58 9%CGST₹5,712.71₹74,900.00",
+        "9%SGST₹5,712.71",
+    ]
+    assert list(_iter_item_rows(lines)) == [(
+        "1",
+        "Apple iPhone 13 (128GB) - (Product) RED |\nB09G99CW2N ( B09G99CW2N )\nHSN:85171300",
+        "63,474.58", "1", "63,474.58", "9%", "CGST", "5,712.71", "74,900.00",
+    )]
+
+def test_item_row_columns_wrapping_onto_following_lines():
+    lines = [
+        "1 Apple iPhone",
+        "₹29,463.39 1 ₹29,463.39",
+        "9% CGST ₹2,651.71 ₹34,770.00",
+    ]
+    assert list(_iter_item_rows(lines)) == [(
+        "1", " Apple iPhone\n",
+        "29,463.39", "1", "29,463.39", "9%", "CGST", "2,651.71", "34,770.00",
+    )]
+
+def test_lone_tax_line_does_not_open_a_row():
+    lines = [
+        "1Phone",
+        "HSN:8517₹100.00 1₹100.00 9%CGST₹9.00₹118.00",
+        "9%SGST₹9.00",
+        "2Case HSN:3926₹50.00 2₹100.00 18%IGST₹18.00₹118.00",
+    ]
+    assert [(row[0], row[1]) for row in _iter_item_rows(lines)] == [
+        ("1", "Phone\nHSN:8517"),
+        ("2", "Case HSN:3926"),
+    ]
+
+def test_quantity_run_into_the_unit_price():
+    lines = [
+        "1Apple iPhone 13 (128GB) - (Product) RED |",
+        "HSN:85171300₹63,474.581₹63,474.58 9%CGST₹5,712.71₹74,900.00",
+    ]
+    assert list(_iter_item_rows(lines)) == [(
+        "1", "Apple iPhone 13 (128GB) - (Product) RED |\nHSN:85171300",
+        "63,474.58", "1", "63,474.58", "9%", "CGST", "5,712.71", "74,900.00",
+    )]
+
+def test_incomplete_row_is_skipped_with_a_warning(caplog):
+    lines = ["1 Apple iPhone", "₹29,463.39 1 ₹29,463.39"]
+    with caplog.at_level(logging.WARNING, logger="extract_amazon"):
+        assert list(_iter_item_rows(lines)) == []
+    assert "Item row 1" in caplog.text
+
+
+def _sample_text(file_name):
+    # The extracted text starts with a space before the header
+    return extract_text_from_pdf(os.path.join(INPUT_DIR, file_name)).lstrip()
+
+def test_single_invoice_text_is_returned_unchanged():
+    text = _sample_text("Iphoneinvoicev2.pdf")
+    assert split_amazon_invoices(text) == [text]
+
+def test_concatenated_invoices_are_split():
+    first = _sample_text("Iphoneinvoicev2.pdf")
+    second = _sample_text("pdfcoffee.com_invoice-amazonpdf-pdf-free.pdf")
+    assert split_amazon_invoices(first + second) == [first, second]
+    assert [invoice.order_id for invoice in parse_amazon_invoices(first + second)] == [
+        "402-5005041-4753952", "407-8153595-7245952"]
+
+def test_continuation_page_stays_with_its_invoice():
+    first = _sample_text("Iphoneinvoicev2.pdf").replace("Page 1 of 1", "Page 1 of 2")
+    continuation = "Tax Invoice/Bill of Supply/Cash Memo\n(Original for Recipient)\nPage 2 of 2\nTerms and conditions\n"
+    second = _sample_text("pdfcoffee.com_invoice-amazonpdf-pdf-free.pdf")
+    assert split_amazon_invoices(first + continuation + second) == [first + continuation, second]
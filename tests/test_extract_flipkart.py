@@ -0,0 +1,139 @@
+import time
+
+import pytest
+
+from extract_flipkart import (
+    _classify_item_line,
+    _find_flipkart_sections,
+    _iter_flipkart_sections,
+    _match_item_block,
+    _scan_section_header,
+    _STANDARD_PRODUCT_RE,
+    LINE_OTHER,
+    LINE_NON_ITEM,
+    LINE_TOTAL_SUMMARY,
+    LINE_ITEM_START,
+    LINE_NUMERIC_START,
+)
+from invoice_models import Invoice
+
+# Stripped item-section lines as they come out of Input_pdfs/243.pdf
+@pytest.mark.parametrize("line, label", [
+    ("Amount ₹Discounts", LINE_NON_ITEM),
+    ("₹Total ₹", LINE_NON_ITEM),
+    ("GSTIN  - 09AAFCI2112P1ZF", LINE_NON_ITEM),
+    ("Grand Total ₹ 149.00", LINE_NON_ITEM),
+    ("Contact Flipkart: 044 - 66904500 || www.flipkart.com/helpcentre", LINE_NON_ITEM),
+    ("Total 1 149.00 0.00 126.28 11.36 11.36 149.00", LINE_TOTAL_SUMMARY),
+    ("SAC: 998599 Freight charges for pick up of", LINE_ITEM_START),
+    ("FSN:MOBGTAGPTB3VS24W", LINE_ITEM_START),
+    ("HSN/SAC:85171300", LINE_ITEM_START),
+    ("Shipping And Handling Charges 1 40.00 0.00 33.90 3.05 3.05 40.00", LINE_ITEM_START),
+    ("1 13065.00 0.00 11072.04 996.48 996.48 13065.00", LINE_NUMERIC_START),
+    ("used product", LINE_OTHER),
+    ("9.0 % SGST/UTGST:1 149.00 0.00 126.28 11.36 11.36 149.00", LINE_OTHER),
+    ("", LINE_OTHER),
+])
+def test_classify_item_line(line, label):
+    assert _classify_item_line(line) == label
+
+def test_non_item_patterns_are_case_insensitive():
+    assert _classify_item_line("SIGNATURE") == LINE_NON_ITEM
+    assert _classify_item_line("payment details") == LINE_NON_ITEM
+
+def test_non_item_label_takes_precedence():
+    # "Total items:" is a summary line even though it starts like a "Total" row
+    assert _classify_item_line("Total items: 1") == LINE_NON_ITEM
+
+def test_column_header_only_skipped_when_alone():
+    # Anchored column headers must not swallow a description that merely contains them
+    assert _classify_item_line("₹SGST") == LINE_NON_ITEM
+    assert _classify_item_line("Cable ₹SGST included") == LINE_OTHER
+
+def test_standard_product_block():
+    block = ("FSN:\nMOBGS2W3BG7HUZFZ\nHSN/SAC: 85171300realme 11 5G (Glory Black,\n256 GB)\n"
+             "Warranty: 1 Year Manufacturer Warranty for\nPhone and 6 Months Warranty for In the Box\n"
+             "Accessories\n1. [IMEI/Serial No:  ] 86152206279 9177\n9.0 % CGST:\n"
+             "9.0 % SGST/UTGST:1 17999.00 -2134.00 13444.92 1210.05 1210.05 15865.00")
+    item, consumed_lines, rule_name = _match_item_block(block)
+    assert rule_name == "Standard Product"
+    assert consumed_lines == 10
+    assert item.description == "FSN: MOBGS2W3BG7HUZFZ HSN/SAC: 85171300 realme 11 5G (Glory Black, 256 GB)"
+    assert (item.quantity, item.unit_price, item.total_item_price) == (1, 17999.0, 15865.0)
+
+def test_standard_product_pattern_fails_fast_on_whitespace_runs():
+    # Used to backtrack for minutes: every whitespace run could be split
+    # between several adjacent whitespace groups
+    start = time.perf_counter()
+    assert _STANDARD_PRODUCT_RE.search(" \n" * 500 + "x") is None
+    assert time.perf_counter() - start < 1.0
+
+_TWO_SECTION_DOCUMENT = (
+    "Tax Invoice\nOrder ID: OD1\nE. & O.E. page 1 of 2\n"
+    "  Tax Invoice\nOrder ID: OD2\n\nE. & O.E. page 2 of 2\n \n"
+)
+
+def test_find_flipkart_sections():
+    sections = [(marker, _TWO_SECTION_DOCUMENT[start:end])
+                for marker, start, end in _find_flipkart_sections(_TWO_SECTION_DOCUMENT)]
+    # The whitespace-only text after the last marker is not a section
+    assert sections == [
+        ("", "Tax Invoice\nOrder ID: OD1"),
+        ("E. & O.E. page 1 of 2", "Tax Invoice\nOrder ID: OD2"),
+    ]
+
+def test_iter_flipkart_sections_is_independent_of_chunking():
+    expected = [(marker, _TWO_SECTION_DOCUMENT[start:end])
+                for marker, start, end in _find_flipkart_sections(_TWO_SECTION_DOCUMENT)]
+    for cut in range(len(_TWO_SECTION_DOCUMENT) + 1):
+        chunks = [_TWO_SECTION_DOCUMENT[:cut], _TWO_SECTION_DOCUMENT[cut:]]
+        sections = [(marker, text[start:end]) for text, marker, start, end in _iter_flipkart_sections(chunks)]
+        assert sections == expected, cut
+
+def test_iter_flipkart_sections_waits_for_marker_to_end():
+    # "page 1 of 1" at the end of a chunk may still continue as "page 1 of 12"
+    chunks = ["A\nE. & O.E. page 1 of 1", "2\nB\n"]
+    sections = [(marker, text[start:end]) for text, marker, start, end in _iter_flipkart_sections(chunks)]
+    assert sections == [("", "A"), ("E. & O.E. page 1 of 12", "B")]
+
+class _CountingLines(list):
+    """A list that counts how many of its items were iterated over."""
+    read = 0
+
+    def __iter__(self):
+        for line in super().__iter__():
+            self.read += 1
+            yield line
+
+def test_section_header_scan_stops_after_the_last_field():
+    # The section repeats the global Order ID; that still counts as found
+    lines = _CountingLines([
+        "Order ID: OD430583065372371100",
+        "Order Date: 26-02-2024",
+        "Invoice Date: 27-02-2024",
+        "Invoice Number # SAADHL2400007085Tax Invoice",
+        "Grand Total ₹ 149.00",
+        "Order ID: OD999999999999999999",
+        "Signature",
+    ])
+    data = Invoice(invoice_type="Unknown", order_id="OD430583065372371100", invoice_date="26-02-2024")
+    _scan_section_header(lines, data)
+    assert lines.read == 5
+    assert data == Invoice(invoice_type="Tax Invoice", invoice_number="SAADHL2400007085",
+                           order_id="OD430583065372371100", invoice_date="27-02-2024", total_amount=149.0)
+
+def test_order_date_stands_in_for_the_invoice_date():
+    lines = _CountingLines(["Order Date: 26-02-2024", "Order ID: OD1", "Tax Invoice"])
+    data = Invoice(invoice_type="Unknown")
+    _scan_section_header(lines, data)
+    assert lines.read == 3
+    assert (data.invoice_type, data.order_id, data.invoice_date) == ("Tax Invoice", "OD1", "26-02-2024")
+
+@pytest.mark.parametrize("date_lines", [
+    ["Order Date: 26-02-2024", "Invoice Date: 27-02-2024"],
+    ["Invoice Date: 27-02-2024", "Order Date: 26-02-2024"],
+])
+def test_invoice_date_wins_over_order_date_in_either_order(date_lines):
+    data = Invoice(invoice_type="Unknown", invoice_date="01-01-2024")
+    _scan_section_header(["Tax Invoice", "Order ID: OD1"] + date_lines, data)
+    assert data.invoice_date == "27-02-2024"
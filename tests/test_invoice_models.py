@@ -0,0 +1,50 @@
+import pytest
+
+from invoice_models import Invoice, LineItem, parse_amount
+
+
+def test_invoice_to_dict():
+    invoice = Invoice(
+        invoice_type="Tax Invoice",
+        invoice_number="FAJ2J42400074476",
+        order_id="OD430583065372371100",
+        invoice_date="27-02-2024",
+        total_amount=13065.0,
+        items=[LineItem(description="realme 11 5G", quantity=1, unit_price=17999.0, total_item_price=15865.0)],
+    )
+    assert invoice.to_dict() == {
+        "Invoice Type": "Tax Invoice",
+        "Invoice Number": "FAJ2J42400074476",
+        "Order ID": "OD430583065372371100",
+        "Invoice Date": "27-02-2024",
+        "Total Amount": 13065.0,
+        "Items": [{"Description": "realme 11 5G", "Quantity": 1, "Unit Price": 17999.0, "Total Item Price": 15865.0}],
+    }
+
+def test_invoice_to_dict_without_total_or_items():
+    assert Invoice().to_dict() == {
+        "Invoice Type": "",
+        "Invoice Number": "",
+        "Order ID": "",
+        "Invoice Date": "",
+        "Total Amount": "",
+        "Items": [],
+    }
+
+def test_zero_total_is_kept():
+    assert Invoice(total_amount=0.0).to_dict()["Total Amount"] == 0.0
+
+def test_invoices_do_not_share_items():
+    first, second = Invoice(), Invoice()
+    first.items.append(LineItem())
+    assert second.items == []
+
+@pytest.mark.parametrize("amount_text, amount", [
+    ("13065.00", 13065.0),
+    ("-2800.00", -2800.0),
+    ("", None),
+    (None, None),
+    ("1,234.50", None),
+])
+def test_parse_amount(amount_text, amount):
+    assert parse_amount(amount_text) == amount
@@ -0,0 +1,34 @@
+import asyncio
+import os
+import shutil
+
+import pytest
+
+import main_extractor
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "..", "Input_pdfs", "Iphoneinvoicev2.pdf")
+
+
+def test_pipeline_fails_instead_of_hanging_when_the_writer_dies(tmp_path, monkeypatch):
+    pdf_paths = []
+    for number in range(6):
+        pdf_path = str(tmp_path / f"invoice_{number}.pdf")
+        shutil.copyfile(SAMPLE_PDF, pdf_path)
+        pdf_paths.append(pdf_path)
+
+    def failing_writer(result, output_folder, write_only):
+        raise OSError("disk full")
+    monkeypatch.setattr(main_extractor, "write_parsed_invoices", failing_writer)
+
+    # With one slot per queue, the parser blocks on the write queue soon after the writer dies
+    pipeline = main_extractor.run_pipeline(pdf_paths, str(tmp_path), None, workers=1, queue_size=1,
+                                           log_level="ERROR", on_result=lambda pdf_path, result: None)
+    with pytest.raises(OSError, match="disk full"):
+        asyncio.run(asyncio.wait_for(pipeline, timeout=60))
+
+def test_workers_and_section_workers_cannot_be_combined(capsys):
+    assert main_extractor.parse_args(["--workers", "4"]).workers == 4
+    assert main_extractor.parse_args(["--section-workers", "4"]).section_workers == 4
+    with pytest.raises(SystemExit):
+        main_extractor.parse_args(["--workers", "2", "--section-workers", "2"])
+    assert "--section-workers cannot be combined with --workers" in capsys.readouterr().err
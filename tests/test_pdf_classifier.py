@@ -0,0 +1,51 @@
+import csv
+import os
+import shutil
+
+import extract_amazon
+import extract_flipkart
+from pdf_classifier import classify_main, classify_pdf
+
+INPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "Input_pdfs")
+
+
+def _fail_if_parsed(monkeypatch):
+    def parse(*args, **kwargs):
+        raise AssertionError("classify must not parse invoices")
+    monkeypatch.setattr(extract_flipkart, "parse_flipkart_invoice", parse)
+    monkeypatch.setattr(extract_amazon, "parse_amazon_invoice", parse)
+    monkeypatch.setattr(extract_amazon, "parse_amazon_invoices", parse)
+
+def test_classify_pdf_reports_vendor_and_page_count(monkeypatch):
+    _fail_if_parsed(monkeypatch)
+    record = classify_pdf(os.path.join(INPUT_DIR, "243.pdf"))
+    assert record["status"] == "classified"
+    assert record["vendor"] == "Flipkart"
+    assert record["pages"] == 8
+    assert record["error"] is None
+
+def test_classify_command_writes_an_inventory(monkeypatch, tmp_path):
+    _fail_if_parsed(monkeypatch)
+    input_dir = tmp_path / "pdfs"
+    input_dir.mkdir()
+    for file_name in ("243.pdf", "Iphoneinvoicev2.pdf"):
+        shutil.copy(os.path.join(INPUT_DIR, file_name), input_dir)
+    (input_dir / "notes.txt").write_text("not a PDF")
+    inventory_path = tmp_path / "inventory.csv"
+
+    classify_main(["--input-dir", str(input_dir), "--output", str(inventory_path)], "unused")
+
+    with open(inventory_path, newline="", encoding="utf-8") as file:
+        records = {os.path.basename(row["file"]): row for row in csv.DictReader(file)}
+    assert sorted(records) == ["243.pdf", "Iphoneinvoicev2.pdf"]
+    assert (records["243.pdf"]["vendor"], records["243.pdf"]["pages"]) == ("Flipkart", "8")
+    assert (records["Iphoneinvoicev2.pdf"]["vendor"], records["Iphoneinvoicev2.pdf"]["pages"]) == ("Amazon", "1")
+    assert all(row["status"] == "classified" for row in records.values())
+
+def test_unreadable_file_is_reported_as_failed(tmp_path):
+    broken_pdf = tmp_path / "broken.pdf"
+    broken_pdf.write_bytes(b"not a PDF")
+    record = classify_pdf(str(broken_pdf))
+    assert record["status"] == "failed"
+    assert record["vendor"] is None
+    assert record["error"]
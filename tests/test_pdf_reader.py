@@ -0,0 +1,51 @@
+import hashlib
+import os
+
+import pytest
+
+from pdf_reader import iter_cached_page_texts, iter_page_texts, normalize_text, TEXT_EXTRACTOR_VERSION
+from text_cache import TextCache
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "..", "Input_pdfs", "243.pdf")
+
+
+def _cache_key(cache):
+    with open(SAMPLE_PDF, "rb") as file:
+        return cache.make_key(hashlib.sha256(file.read()).hexdigest(), TEXT_EXTRACTOR_VERSION)
+
+def test_cached_pages_are_written_and_read_one_at_a_time(tmp_path):
+    cache = TextCache(str(tmp_path / "cache.sqlite3"))
+    decoded = [page_text for _, page_text in iter_page_texts(SAMPLE_PDF)]
+
+    assert list(iter_cached_page_texts(SAMPLE_PDF, cache)) == decoded
+    key = _cache_key(cache)
+    assert cache.page_count(key) == len(decoded) == 8
+    assert cache.get_page(key, 3) == decoded[2]
+
+    # A hit is served page by page; a page evicted meanwhile is decoded again
+    cache._connect().execute("DELETE FROM pages WHERE key = ? AND page_number >= 5", (key,))
+    assert list(iter_cached_page_texts(SAMPLE_PDF, cache)) == decoded
+
+def test_stopping_early_leaves_no_cache_entry(tmp_path):
+    cache = TextCache(str(tmp_path / "cache.sqlite3"))
+    page_texts = iter_cached_page_texts(SAMPLE_PDF, cache)
+    next(page_texts)
+    next(page_texts)
+    page_texts.close()
+
+    key = _cache_key(cache)
+    assert cache.page_count(key) is None
+    assert cache._connect().execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 0
+
+@pytest.mark.parametrize("text, expected", [
+    ("Total: \uff11\uff12\uff13.\uff10\uff10", "Total: 123.00"),
+    ("Order \uff29\uff24\uff1a OD123", "Order ID: OD123"),
+    ("\ufb01nal o\ufb00er", "final offer"),
+    ("\u20b929,463.39", "\u20b929,463.39"),
+    ("\uffe5 and \u20a8", "\u00a5 and Rs"),
+    ("Grand\u00a0Total\u2009:\u1680\u20b9 1,499", "Grand Total : \u20b9 1,499"),
+    ("INV\u200b-42\ufeff\u2060", "INV-42"),
+    ("plain ASCII text", "plain ASCII text"),
+])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
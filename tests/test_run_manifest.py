@@ -0,0 +1,71 @@
+import os
+
+from run_manifest import RunManifest, fingerprint_file
+
+VERSION = "Amazon-6+Flipkart-4/writer-1/triage-2"
+
+
+def _process(manifest, tmp_path, name, content=b"%PDF-1.4 invoice", status="written"):
+    pdf_path = tmp_path / "input" / name
+    pdf_path.parent.mkdir(exist_ok=True)
+    pdf_path.write_bytes(content)
+    output_path = tmp_path / f"{name}.xlsx"
+    output_path.write_bytes(b"workbook")
+    result = {"file": name, "status": status, "output": str(output_path),
+              "fingerprint": fingerprint_file(str(pdf_path))}
+    manifest.record(str(pdf_path), result, VERSION)
+    return str(pdf_path), str(output_path)
+
+def test_unchanged_input_is_skipped_after_reload(tmp_path):
+    manifest = RunManifest(str(tmp_path / "manifest.json"))
+    pdf_path, _ = _process(manifest, tmp_path, "a.pdf")
+    manifest.save()
+
+    manifest = RunManifest(str(tmp_path / "manifest.json"))
+    assert manifest.is_up_to_date(pdf_path, VERSION)
+    assert not manifest.is_up_to_date(pdf_path, VERSION.replace("triage-2", "triage-1"))
+
+def test_failed_result_is_not_recorded(tmp_path):
+    manifest = RunManifest(str(tmp_path / "manifest.json"))
+    pdf_path, _ = _process(manifest, tmp_path, "a.pdf", status="failed")
+    assert not manifest.is_up_to_date(pdf_path, VERSION)
+
+def test_changed_content_is_reprocessed(tmp_path):
+    manifest = RunManifest(str(tmp_path / "manifest.json"))
+    pdf_path, _ = _process(manifest, tmp_path, "a.pdf", b"%PDF-1.4 first")
+    stat = os.stat(pdf_path)
+    with open(pdf_path, "wb") as file:
+        file.write(b"%PDF-1.4 other") # Same size, so only the hash tells them apart
+    os.utime(pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not manifest.is_up_to_date(pdf_path, VERSION)
+
+def test_unchanged_content_with_a_new_mtime_is_skipped(tmp_path):
+    manifest = RunManifest(str(tmp_path / "manifest.json"))
+    pdf_path, _ = _process(manifest, tmp_path, "a.pdf")
+    stat = os.stat(pdf_path)
+    new_mtime_ns = stat.st_mtime_ns + 10**9
+    os.utime(pdf_path, ns=(stat.st_atime_ns, new_mtime_ns))
+
+    assert manifest.is_up_to_date(pdf_path, VERSION)
+    assert manifest.entries[os.path.abspath(pdf_path)]["mtime_ns"] == new_mtime_ns
+
+def test_changed_or_missing_output_is_reprocessed(tmp_path):
+    manifest = RunManifest(str(tmp_path / "manifest.json"))
+    pdf_path, output_path = _process(manifest, tmp_path, "a.pdf")
+    with open(output_path, "ab") as file:
+        file.write(b" edited")
+    assert not manifest.is_up_to_date(pdf_path, VERSION)
+
+    pdf_path, output_path = _process(manifest, tmp_path, "b.pdf")
+    os.remove(output_path)
+    assert not manifest.is_up_to_date(pdf_path, VERSION)
+
+def test_prune_only_drops_removed_inputs_of_the_current_folder(tmp_path):
+    manifest = RunManifest(str(tmp_path / "manifest.json"))
+    kept_path, _ = _process(manifest, tmp_path, "kept.pdf")
+    removed_path, _ = _process(manifest, tmp_path, "removed.pdf")
+    other_folder_entry = os.path.abspath(str(tmp_path / "other_input" / "c.pdf"))
+    manifest.entries[other_folder_entry] = dict(manifest.entries[os.path.abspath(kept_path)])
+
+    manifest.prune(str(tmp_path / "input"), [kept_path])
+    assert set(manifest.entries) == {os.path.abspath(kept_path), other_folder_entry}
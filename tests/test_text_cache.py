@@ -0,0 +1,42 @@
+import random
+
+import text_cache
+from text_cache import TextCache
+
+
+def _page_texts(seed, page_count=3):
+    # Random text, so each page compresses to a similar, non-trivial size
+    rng = random.Random(seed)
+    return ["".join(rng.choice("0123456789 ABCDEF\n") for _ in range(2000)) for _ in range(page_count)]
+
+def test_get_returns_what_put_stored(tmp_path):
+    cache = TextCache(str(tmp_path / "cache.sqlite3"))
+    key = cache.make_key("ab" * 32, "PyPDF2-3.0.1/2+NFKC")
+    page_texts = ["Tax Invoice\nGrand Total ₹ 149.00", "", "page 3"]
+
+    assert cache.get(key) is None
+    cache.put(key, page_texts)
+    assert cache.get(key) == page_texts
+    assert cache.page_count(key) == 3
+    assert cache.get(cache.make_key("cd" * 32, "PyPDF2-3.0.1/2+NFKC")) is None
+
+def test_least_recently_read_entries_are_evicted_past_the_size_cap(tmp_path, monkeypatch):
+    clock = iter(range(1, 1000))
+    monkeypatch.setattr(text_cache.time, "time", lambda: float(next(clock)))
+    cache = TextCache(str(tmp_path / "cache.sqlite3"))
+    for key in ("a", "b", "c"):
+        cache.put(key, _page_texts(key))
+    sizes = dict(cache._connect().execute("SELECT key, size FROM entries"))
+    # Room for the three entries plus half of another one
+    cache.max_bytes = sum(sizes.values()) + min(sizes.values()) // 2
+
+    assert cache.get("a") is not None # Now "b" is the least recently read
+    cache.put("d", _page_texts("d"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == _page_texts("a")
+    assert cache.get("c") == _page_texts("c")
+    assert cache.get("d") == _page_texts("d")
+    stored_size = cache._connect().execute("SELECT SUM(size) FROM pages").fetchone()[0]
+    assert stored_size <= cache.max_bytes
+    assert cache._connect().execute("SELECT COUNT(*) FROM pages WHERE key = 'b'").fetchone()[0] == 0
@@ -0,0 +1,52 @@
+from vendor_detector import VendorDetector, default_detector
+import extract_amazon
+import extract_flipkart
+
+
+def _parser(text, workers=1):
+    return []
+
+def test_highest_confidence_wins_within_a_priority():
+    detector = VendorDetector()
+    detector.register("A", ("a.com", "a ltd"), _parser)
+    detector.register("B", ("b.com", "b ltd"), _parser)
+    match = detector.detect("Sold via A.com by B Ltd, see b.com")
+    assert (match.vendor, match.confidence, match.matched_fingerprints) == ("B", 1.0, ("b.com", "b ltd"))
+
+def test_tie_goes_to_the_vendor_registered_first():
+    detector = VendorDetector()
+    detector.register("A", ("a.com",), _parser)
+    detector.register("B", ("b.com",), _parser)
+    assert detector.detect("b.com and a.com").vendor == "A"
+
+def test_higher_priority_wins_over_confidence():
+    detector = VendorDetector()
+    detector.register("A", ("a.com", "a ltd"), _parser)
+    detector.register("B", ("b.com", "b ltd"), _parser, priority=1)
+    match = detector.detect("A Ltd, a.com, b.com")
+    assert (match.vendor, match.confidence) == ("B", 0.5)
+
+def test_no_fingerprint_found():
+    detector = VendorDetector()
+    assert detector.detect("anything") is None
+    detector.register("A", ("a.com",), _parser)
+    assert detector.detect("anything") is None
+
+def test_flipkart_invoice_mentioning_amazon_is_flipkart():
+    text = ("Tax Invoice\nSold By: Amazon Seller Services Pvt. Ltd. (see amazon.in)\n"
+            "Contact Flipkart: 044 - 66904500 || www.flipkart.com/helpcentre")
+    match = default_detector.detect(text)
+    assert match.vendor == "Flipkart"
+    assert match.parser is extract_flipkart.parse_flipkart_invoice
+
+def test_amazon_invoice():
+    match = default_detector.detect("Sold by Amazon Seller Services Pvt. Ltd.")
+    assert (match.vendor, match.parser) == ("Amazon", extract_amazon.parse_amazon_invoices)
+
+def test_version_key_names_every_vendor_and_parser_version():
+    detector = VendorDetector()
+    detector.register("B", ("b.com",), _parser, version="2")
+    detector.register("A", ("a.com",), _parser, version="7")
+    assert detector.version_key() == "A-7+B-2"
+    assert default_detector.version_key() == (f"Amazon-{extract_amazon.PARSER_VERSION}"
+                                              f"+Flipkart-{extract_flipkart.PARSER_VERSION}")